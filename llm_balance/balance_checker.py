@@ -3,27 +3,37 @@ Main balance checker functionality
 """
 
 import json
-import threading
+import os
+import sys
+import time
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from .config import ConfigManager
 from .platform_configs import PlatformConfig
 from .platform_handlers.base import BasePlatformHandler, CostInfo
-from .utils import get_nested_value, format_output, convert_currency, get_exchange_rates
-from .platform_handlers import create_handler
+from .utils import (format_output, convert_currency, get_exchange_rates, cache_fingerprint, is_error_result, json_default,
+                    MAX_WORKERS, map_concurrently, print_line)
+from .platform_handlers import get_handler
+
+def _intern(value):
+    """Intern low-cardinality label strings (platform, currency); other values pass through"""
+    return sys.intern(value) if type(value) is str else value
 
 class BalanceChecker:
     """Main balance checker class"""
     
-    def __init__(self, config_file: str = None, browser: str = None):
+    def __init__(self, config_file: str = None, browser: str = None,
+                 use_cache: bool = True, refresh: bool = False):
         self.config_manager = ConfigManager(config_file)
         # Use provided browser or fall back to global configuration
         self.browser = browser or self.config_manager.get_global_browser()
-        self.handlers = {}
-        # Thread pool size for concurrent platform checking
-        self.max_workers = 5
-        # Thread lock for handler cache
-        self._handler_lock = threading.Lock()
+        # On-disk result cache: use_cache=False bypasses it entirely,
+        # refresh=True skips cached reads but still stores fresh results
+        self.use_cache = use_cache
+        self.refresh = refresh
+        self.cache_dir = Path.home() / '.llm_balance' / 'cache' / 'balances'
+        self.max_workers = MAX_WORKERS
 
     def _check_single_balance(self, platform_config: PlatformConfig) -> Optional[Dict[str, Any]]:
         """Check balance for a single platform (thread-safe helper method)"""
@@ -32,18 +42,18 @@ class BalanceChecker:
             if not platform_config.show_cost:
                 return None
 
-            handler = self._get_handler(platform_config)
-            balance_info = handler.get_balance()
+            balance_info = self._fetch_balance(platform_config)
             return {
-                'platform': balance_info.platform,
+                # Interned so the per-currency lookups when formatting compare by identity
+                'platform': _intern(balance_info.platform),
                 'balance': balance_info.balance,
-                'currency': balance_info.currency,
+                'currency': _intern(balance_info.currency),
                 'spent': balance_info.spent,
-                'spent_currency': balance_info.spent_currency,
+                'spent_currency': _intern(balance_info.spent_currency),
                 'raw_data': balance_info.raw_data
             }
         except Exception as e:
-            print(f"Error checking {platform_config.name}: {e}")
+            print_line(f"Error checking {platform_config.name}: {e}")
             return None
 
     def check_all_balances(self, sort: str = 'name') -> List[Dict[str, Any]]:
@@ -56,7 +66,8 @@ class BalanceChecker:
         balances = []
         platforms = [p for p in self.config_manager.get_enabled_platforms() if p.show_cost]
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+        workers = max(1, min(len(platforms), self.max_workers))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
             # Submit all platform checks to thread pool
             future_to_platform = {
                 executor.submit(self._check_single_balance, config): config
@@ -106,6 +117,10 @@ class BalanceChecker:
 
         return balances
     
+    def check_platforms_balances(self, platform_names: List[str]) -> List[Optional[CostInfo]]:
+        """Check several named platforms concurrently, returning results in the given order"""
+        return map_concurrently(self.check_platform_balance, platform_names, self.max_workers)
+
     def check_platform_balance(self, platform_name: str) -> Optional[CostInfo]:
         """Check balance for a specific platform"""
         platform_config = self.config_manager.get_platform(platform_name)
@@ -120,21 +135,60 @@ class BalanceChecker:
 
         try:
             # self.config_manager.get_platform already returns PlatformConfig
-            handler = self._get_handler(platform_config)
-            return handler.get_balance()
+            return self._fetch_balance(platform_config)
         except Exception as e:
-            print(f"Error checking {platform_name}: {e}")
+            print_line(f"Error checking {platform_name}: {e}")
             return None
     
+    def _fetch_balance(self, platform_config: PlatformConfig) -> CostInfo:
+        """Get a platform's balance, served from the cache while it is fresh"""
+        balance_info = self._load_cached(platform_config)
+        if balance_info is None:
+            balance_info = self._get_handler(platform_config).get_balance()
+            # Error placeholders (zeroed balance plus raw_data['error']) are shown but never cached
+            if not is_error_result(balance_info.raw_data):
+                self._store_cached(platform_config, balance_info)
+        return balance_info
+
+    def _cache_path(self, platform_config: PlatformConfig) -> Path:
+        """Cache file for a platform, keyed by platform, browser (cookie source) and credentials"""
+        return self.cache_dir / f"{platform_config.name}-{self.browser}-{cache_fingerprint(platform_config)}.json"
+
+    def _load_cached(self, platform_config: PlatformConfig) -> Optional[CostInfo]:
+        """Return the cached balance if it is younger than the platform's cache_ttl"""
+        if not self.use_cache or self.refresh or platform_config.cache_ttl <= 0:
+            return None
+        cache_path = self._cache_path(platform_config)
+        try:
+            if time.time() - cache_path.stat().st_mtime >= platform_config.cache_ttl:
+                return None
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return CostInfo(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            # Missing, unreadable or outdated cache entry - fetch from the platform
+            return None
+
+    def _store_cached(self, platform_config: PlatformConfig, balance_info: CostInfo):
+        """Write a balance to the cache; failures only cost the next run a fetch"""
+        if not self.use_cache or platform_config.cache_ttl <= 0:
+            return
+        cache_path = self._cache_path(platform_config)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(balance_info.__dict__, f, ensure_ascii=False, default=json_default)
+            # Atomic swap so concurrent invocations never read a half-written file
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError):
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
     def _get_handler(self, config: PlatformConfig) -> BasePlatformHandler:
         """Get handler instance for platform configuration (thread-safe)"""
-        # Use double-checked locking pattern for efficiency
-        if config.name not in self.handlers:
-            with self._handler_lock:
-                # Check again after acquiring lock
-                if config.name not in self.handlers:
-                    self.handlers[config.name] = create_handler(config, self.browser)
-        return self.handlers[config.name]
+        return get_handler(config, self.browser)
     
     def list_platforms(self) -> List[str]:
         """List all available platforms"""
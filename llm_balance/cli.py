@@ -2,12 +2,42 @@
 CLI interface for LLM Balance Checker
 """
 
-import fire
 from typing import Optional, List
-from .balance_checker import BalanceChecker
-from .token_checker import TokenChecker
-from .plan_checker import PlanChecker
-from .utils import ensure_config_dir, get_exchange_rates
+# fire and the checkers (requests, handler modules) are imported where they are used,
+# so commands such as rates and list don't pay for them at startup
+from .utils import ensure_config_dir, get_exchange_rates, get_available_currencies
+
+# Subcommand names; any other first argument naming a platform is routed to `platform`
+_COMMANDS = frozenset((
+    'cost', 'package', 'platform', 'plan', 'check', 'list',
+    'enable', 'disable', 'config', 'set_browser', 'rates',
+    'setup_guide', 'doctor', 'generate_config', 'platform_config',
+))
+
+# Browsers set_browser accepts, in the order they are listed to the user
+_SUPPORTED_BROWSERS = ('chrome', 'firefox', 'arc', 'brave', 'chromium', 'vivaldi')
+_SUPPORTED_BROWSER_SET = frozenset(_SUPPORTED_BROWSERS)
+
+# Fixed parts of the rates listing
+_RATES_BANNER = "=" * 40
+_RATES_HEADER = f"Current Exchange Rates (to CNY):\n{_RATES_BANNER}\n"
+_RATES_FOOTER = f"{_RATES_BANNER}\nCustomize rates with: LLM_BALANCE_RATES='{{\"USD\": 7.2}}'"
+
+# Boolean spellings accepted by the config commands
+_BOOL_VALUES = {'true': True, 'false': False}
+
+def _coerce_config_value(value):
+    """Convert a string from the command line to bool, int or float when it spells one"""
+    if not isinstance(value, str):
+        return value
+    flag = _BOOL_VALUES.get(value.lower())
+    if flag is not None:
+        return flag
+    if value.isdigit():
+        return int(value)
+    if value.replace('.', '').isdigit():
+        return float(value)
+    return value
 
 class LLMBalanceCLI:
     """CLI interface for checking LLM platform costs"""
@@ -16,13 +46,24 @@ class LLMBalanceCLI:
         self.config_file = config_file
         # Will be set by BalanceChecker using global config
         self.browser = browser
+        # Configuration shared by the config subcommands, loaded on first use
+        self._config_manager = None
         ensure_config_dir()
+
+    def _get_config_manager(self):
+        """Get the configuration manager, parsing the config file only once per CLI instance"""
+        if self._config_manager is None:
+            from .config import ConfigManager
+            self._config_manager = ConfigManager(self.config_file)
+        return self._config_manager
     
     def cost(self, platform: Optional[str] = None,
               format: str = 'table',
               browser: Optional[str] = None,
               currency: str = 'CNY',
-              sort: str = 'name') -> str:
+              sort: str = 'name',
+              no_cache: bool = False,
+              refresh: bool = False) -> str:
         """
         Check costs for LLM platforms
 
@@ -36,12 +77,16 @@ class LLMBalanceCLI:
                  - name: Sort alphabetically by platform name (default)
                  - balance: Sort by balance amount (descending)
                  - none: Keep the order as results complete
+            no_cache: Neither read nor write the on-disk result cache
+            refresh: Ignore cached results and fetch fresh data (the cache is still updated)
 
         Returns:
             Formatted cost information
         """
+        from .balance_checker import BalanceChecker
+
         browser = browser or self.browser
-        checker = BalanceChecker(self.config_file, browser)
+        checker = BalanceChecker(self.config_file, browser, use_cache=not no_cache, refresh=refresh)
 
         # Validate sort parameter
         valid_sorts = ['name', 'balance', 'none']
@@ -68,10 +113,9 @@ class LLMBalanceCLI:
                 else:
                     return f"Platform '{platforms[0]}' not found or could not retrieve balance"
             else:
-                # Multiple platforms - convert to dict list
+                # Multiple platforms - fetch concurrently, then convert to dict list in the given order
                 balances = []
-                for p in platforms:
-                    balance = checker.check_platform_balance(p)
+                for p, balance in zip(platforms, checker.check_platforms_balances(platforms)):
                     if balance:
                         balances.append({
                             'platform': balance.platform,
@@ -119,7 +163,10 @@ class LLMBalanceCLI:
                show_expiry: bool = True,
                show_reset: bool = True,
                show_reset_time: bool = True,
-               sort: str = 'name') -> str:
+               sort: str = 'name',
+               no_cache: bool = False,
+               refresh: bool = False,
+               compact: bool = False) -> str:
         """
         Check model-level package/tokens for LLM platforms
 
@@ -138,12 +185,17 @@ class LLMBalanceCLI:
             sort: Sort order for results (name, none)
                  - name: Sort alphabetically by platform name (default)
                  - none: Keep the order as results complete
+            no_cache: Neither read nor write the on-disk result cache
+            refresh: Ignore cached results and fetch fresh data (the cache is still updated)
+            compact: Emit single-line JSON without indentation (json format only)
 
         Returns:
             Formatted package information with model-level details
         """
+        from .token_checker import TokenChecker
+
         browser = browser or self.browser
-        checker = TokenChecker(self.config_file, browser)
+        checker = TokenChecker(self.config_file, browser, use_cache=not no_cache, refresh=refresh)
 
         # Validate sort parameter
         valid_sorts = ['name', 'none']
@@ -162,12 +214,8 @@ class LLMBalanceCLI:
             if not platforms:
                 return "No valid platforms specified"
 
-            tokens = []
-
-            for p in platforms:
-                token_info = checker.check_platform_tokens(p)
-                if token_info:
-                    tokens.append(token_info)
+            # Fetch concurrently; results keep the order the platforms were given in
+            tokens = [info for info in checker.check_platforms_tokens(platforms) if info]
 
             if not tokens:
                 return "No token data available"
@@ -175,7 +223,7 @@ class LLMBalanceCLI:
             # Check all platforms
             tokens = checker.check_all_tokens(sort=sort)
 
-        return checker.format_tokens(tokens, format, currency, model, show_all, show_expiry, show_reset, show_reset_time)
+        return checker.format_tokens(tokens, format, currency, model, show_all, show_expiry, show_reset, show_reset_time, compact)
 
     def platform(self, platform_name: str, 
                   format: str = 'table',
@@ -195,7 +243,8 @@ class LLMBalanceCLI:
             Formatted platform information including balance, spent, and token usage
         """
         from .utils import format_platform_info
-        
+        from .balance_checker import BalanceChecker
+
         browser = browser or self.browser
         checker = BalanceChecker(self.config_file, browser)
 
@@ -226,6 +275,8 @@ class LLMBalanceCLI:
         Returns:
             Formatted coding plan information
         """
+        from .plan_checker import PlanChecker
+
         browser = browser or self.browser
         checker = PlanChecker(self.config_file, browser)
 
@@ -240,12 +291,9 @@ class LLMBalanceCLI:
             if not platforms:
                 return "No valid platforms specified"
 
-            plans = []
-            for p in platforms:
-                plan_info = checker.check_platform_plan(p)
-                if plan_info:
-                    plans.append(plan_info)
-            
+            # Fetch concurrently; results keep the order the platforms were given in
+            plans = [info for info in checker.check_platforms_plans(platforms) if info]
+
             if not plans:
                 return "No coding plan data available"
         else:
@@ -253,48 +301,28 @@ class LLMBalanceCLI:
 
         return checker.format_plans(plans, format)
 
-    def check(self, platform: Optional[str] = None, 
-              format: str = 'table', 
-              browser: Optional[str] = None,
-              currency: str = 'CNY') -> str:
-        """
-        Check costs for LLM platforms (alias for cost command)
-        
-        Args:
-            platform: Specific platform(s) to check, comma-separated string or tuple (optional)
-                     Examples: "deepseek", "deepseek,aliyun", or multiple --platform flags
-            format: Output format (json, markdown, table, total)
-            browser: Browser to get cookies from (chrome, firefox, arc, brave, chromium, vivaldi)
-            currency: Target currency for total (CNY, USD, EUR, etc.)
-        
-        Returns:
-            Formatted cost information
-        """
-        return self.cost(platform, format, browser, currency)
+    # Alias for the cost command (same function, no forwarding frame)
+    check = cost
     
     def list(self) -> str:
         """List all available platforms"""
-        from .config import ConfigManager
-
-        config_manager = ConfigManager(self.config_file)
+        config_manager = self._get_config_manager()
         platforms = config_manager.get_all_platforms()
 
-        result = "Available platforms:\n"
+        lines = ["Available platforms:"]
         for platform in platforms:
             # Get full config (default + user overrides)
             config = config_manager.get_platform_config(platform)
             if config:
                 enabled = config.get('enabled', False)
                 status = "enabled" if enabled else "disabled"
-                result += f"  {platform} ({status})\n"
+                lines.append(f"  {platform} ({status})")
 
-        return result
+        return "\n".join(lines) + "\n"
     
     def enable(self, platform: str) -> str:
         """Enable one or more platforms (comma-separated or multiple args)."""
-        from .config import ConfigManager
-        
-        config_manager = ConfigManager(self.config_file)
+        config_manager = self._get_config_manager()
         all_platforms = set(config_manager.get_all_platforms())
         
         # Parse input: support tuple from Fire and comma-separated string
@@ -312,22 +340,25 @@ class LLMBalanceCLI:
         # Special case: 'all'
         if any(p.lower() == 'all' for p in platforms):
             enabled_count = 0
-            for name in all_platforms:
-                user_config = config_manager.user_config.get(name, {})
-                if not user_config.get('enabled', True):
-                    config_manager.enable_platform(name)
-                    enabled_count += 1
+            # One config write for the whole batch
+            with config_manager:
+                for name in all_platforms:
+                    user_config = config_manager.user_config.get(name, {})
+                    if not user_config.get('enabled', True):
+                        config_manager.enable_platform(name)
+                        enabled_count += 1
             return f"Enabled {enabled_count} platforms (all disabled platforms)"
         
         # Enable listed platforms
         enabled = []
         not_found = []
-        for name in platforms:
-            if name in all_platforms:
-                config_manager.enable_platform(name)
-                enabled.append(name)
-            else:
-                not_found.append(name)
+        with config_manager:
+            for name in platforms:
+                if name in all_platforms:
+                    config_manager.enable_platform(name)
+                    enabled.append(name)
+                else:
+                    not_found.append(name)
         
         parts = []
         if enabled:
@@ -338,9 +369,7 @@ class LLMBalanceCLI:
     
     def disable(self, platform: str) -> str:
         """Disable one or more platforms (comma-separated or multiple args)."""
-        from .config import ConfigManager
-        
-        config_manager = ConfigManager(self.config_file)
+        config_manager = self._get_config_manager()
         all_platforms = set(config_manager.get_all_platforms())
         
         # Parse input: support tuple from Fire and comma-separated string
@@ -357,22 +386,25 @@ class LLMBalanceCLI:
         # Special case: 'all'
         if any(p.lower() == 'all' for p in platforms):
             disabled_count = 0
-            for name in all_platforms:
-                user_config = config_manager.user_config.get(name, {})
-                if user_config.get('enabled', True):
-                    config_manager.disable_platform(name)
-                    disabled_count += 1
+            # One config write for the whole batch
+            with config_manager:
+                for name in all_platforms:
+                    user_config = config_manager.user_config.get(name, {})
+                    if user_config.get('enabled', True):
+                        config_manager.disable_platform(name)
+                        disabled_count += 1
             return f"Disabled {disabled_count} platforms (all enabled platforms)"
         
         # Disable listed platforms
         disabled = []
         not_found = []
-        for name in platforms:
-            if name in all_platforms:
-                config_manager.disable_platform(name)
-                disabled.append(name)
-            else:
-                not_found.append(name)
+        with config_manager:
+            for name in platforms:
+                if name in all_platforms:
+                    config_manager.disable_platform(name)
+                    disabled.append(name)
+                else:
+                    not_found.append(name)
         
         parts = []
         if disabled:
@@ -390,9 +422,7 @@ class LLMBalanceCLI:
             key: Configuration key (optional)
             value: Configuration value (optional)
         """
-        from .config import ConfigManager
-
-        config_manager = ConfigManager(self.config_file)
+        config_manager = self._get_config_manager()
         config = config_manager.get_platform_config(platform)
 
         if not config:
@@ -414,13 +444,7 @@ class LLMBalanceCLI:
         # Allow setting show_cost and show_package even if they're not in the original config
         if key in config or key in ['show_cost', 'show_package']:
             # Convert string values to appropriate types
-            if isinstance(value, str):
-                if value.lower() in ['true', 'false']:
-                    value = value.lower() == 'true'
-                elif value.isdigit():
-                    value = int(value)
-                elif value.replace('.', '').isdigit():
-                    value = float(value)
+            value = _coerce_config_value(value)
 
             if platform not in config_manager.user_config:
                 config_manager.user_config[platform] = {}
@@ -440,28 +464,19 @@ class LLMBalanceCLI:
         Returns:
             Confirmation message
         """
-        valid_browsers = ['chrome', 'firefox', 'arc', 'brave', 'chromium', 'vivaldi']
-        if browser not in valid_browsers:
-            return f"Invalid browser '{browser}'. Valid options: {', '.join(valid_browsers)}"
+        if browser not in _SUPPORTED_BROWSER_SET:
+            return f"Invalid browser '{browser}'. Valid options: {', '.join(_SUPPORTED_BROWSERS)}"
         
-        checker = BalanceChecker(self.config_file, self.browser)
-        checker.config_manager.set_global_browser(browser)
+        self._get_config_manager().set_global_browser(browser)
         return f"Global browser set to: {browser}"
     
     def rates(self) -> str:
         """Show current exchange rates"""
         rates = get_exchange_rates()
         
-        result = "Current Exchange Rates (to CNY):\n"
-        result += "=" * 40 + "\n"
-        
-        for currency, rate in sorted(rates.items()):
-            result += f"{currency:<10} {rate:>10.4f}\n"
-        
-        result += "=" * 40 + "\n"
-        result += "Customize rates with: LLM_BALANCE_RATES='{\"USD\": 7.2}'"
-        
-        return result
+        # Currency order is sorted once per process alongside the rate table
+        rows = "".join(f"{currency:<10} {rates[currency]:>10.4f}\n" for currency in get_available_currencies())
+        return f"{_RATES_HEADER}{rows}{_RATES_FOOTER}"
     
     def setup_guide(self) -> str:
         """Show full setup guide for all platforms"""
@@ -474,7 +489,6 @@ class LLMBalanceCLI:
         Run comprehensive diagnostics and health checks
         """
         import os
-        from .config import ConfigManager
 
         result = "🔧 LLM Balance Checker 诊断报告\n"
         result += "=" * 50 + "\n\n"
@@ -485,8 +499,7 @@ class LLMBalanceCLI:
         missing_vars = [var for var in env_vars if not os.getenv(var)]
         if missing_vars:
             result += "❌ 缺失的环境变量:\n"
-            for var in missing_vars:
-                result += f"   • {var}\n"
+            result += "".join(f"   • {var}\n" for var in missing_vars)
         else:
             result += "✅ 主要环境变量已设置\n"
 
@@ -500,7 +513,7 @@ class LLMBalanceCLI:
 
         # 检查浏览器
         result += f"\n📋 浏览器配置:\n"
-        config_manager = ConfigManager(self.config_file)
+        config_manager = self._get_config_manager()
         browser = config_manager.get_global_browser()
         result += f"   当前浏览器: {browser}\n"
 
@@ -508,8 +521,7 @@ class LLMBalanceCLI:
         result += f"\n📋 平台注册检查:\n"
         platforms = config_manager.get_all_platforms()
         result += f"   已注册平台数量: {len(platforms)}\n"
-        for name in sorted(platforms):
-            result += f"   • {name}\n"
+        result += "".join(f"   • {name}\n" for name in sorted(platforms))
 
         # 系统状态
         result += f"\n📋 系统状态:\n"
@@ -534,10 +546,8 @@ class LLMBalanceCLI:
         Returns:
             Generation result
         """
-        from .config import ConfigManager
-
         try:
-            config_manager = ConfigManager(self.config_file)
+            config_manager = self._get_config_manager()
             output_path = config_manager.generate_config_file(output)
             result = "✅ 配置文件生成成功\n"
             result += "=" * 30 + "\n\n"
@@ -567,8 +577,9 @@ class LLMBalanceCLI:
         Returns:
             Configuration status
         """
-        import yaml
         from pathlib import Path
+        from .platform_configs import _yaml_codec
+        yaml, yaml_loader, yaml_dumper = _yaml_codec()
 
         # Map platform names to their config file names and supported keys
         platform_configs = {
@@ -637,7 +648,7 @@ class LLMBalanceCLI:
         if config_path.exists():
             try:
                 with open(config_path, 'r', encoding='utf-8') as f:
-                    config = yaml.safe_load(f) or {}
+                    config = yaml.load(f, Loader=yaml_loader) or {}
             except Exception as e:
                 return f"Error loading config: {e}"
 
@@ -660,13 +671,7 @@ class LLMBalanceCLI:
 
         # Set configuration value
         # Convert string values to appropriate types
-        if isinstance(value, str):
-            if value.lower() in ['true', 'false']:
-                value = value.lower() == 'true'
-            elif value.isdigit():
-                value = int(value)
-            elif value.replace('.', '').isdigit():
-                value = float(value)
+        value = _coerce_config_value(value)
 
         config[key] = value
 
@@ -674,7 +679,7 @@ class LLMBalanceCLI:
         try:
             config_path.parent.mkdir(exist_ok=True)
             with open(config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
+                yaml.dump(config, f, Dumper=yaml_dumper, default_flow_style=False, allow_unicode=True)
             return f"Set {platform_lower}.{key} = {value} (stored in {config_path})"
         except Exception as e:
             return f"Error saving config: {e}"
@@ -682,14 +687,13 @@ class LLMBalanceCLI:
 def main():
     """Main CLI entry point"""
     import sys
+    import fire
     from .platform_handlers.registry import registry
     
     if len(sys.argv) > 1:
         command = sys.argv[1]
         
-        if command not in ['cost', 'package', 'platform', 'plan', 'check', 'list', 
-                          'enable', 'disable', 'config', 'set_browser', 'rates', 
-                          'setup_guide', 'doctor', 'generate_config', 'platform_config']:
+        if command not in _COMMANDS:
             if registry.get_handler_class(command):
                 sys.argv[1] = 'platform'
                 sys.argv.insert(2, command)
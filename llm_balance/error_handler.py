@@ -3,6 +3,7 @@
 """
 
 import os
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from .platform_handlers.registry import registry
 
@@ -155,26 +156,17 @@ def _format_platform_list(platforms: List[str], title: str = "平台列表") ->
     
     return '\n'.join(result)
 
-def _get_enabled_platforms() -> List[str]:
-    """获取已启用的平台列表"""
-    enabled = []
-    platform_names = registry.list_platforms()
-    for name in platform_names:
-        platform_info = registry.get_platform(name)
-        if platform_info and platform_info.env_var and os.getenv(platform_info.env_var):
-            enabled.append(name)
-    return enabled
-
+@lru_cache(maxsize=1)
 def get_setup_guide() -> str:
     """获取完整的设置指南"""
-    guide = """
+    parts = ["""
 🚀 LLM Balance Checker 完整配置指南
 
 ====================================
 
 📋 支持的平台:
 ====================================
-"""
+"""]
     
     platforms = registry.list_platforms()
     for platform in platforms:
@@ -189,27 +181,27 @@ def get_setup_guide() -> str:
                 else:
                     env_var_display = '无需环境变量'
                     
-            guide += f"""
+            parts.append(f"""
    • {info['name']} ({platform})
      官网: {info['url']}
      认证方式: {info['auth_type']}
      环境变量: {env_var_display}
-"""
+""")
     
-    guide += """
+    parts.append("""
 🔧 详细配置指南:
 ====================================
-"""
+""")
     
     # 仅针对几个主要平台显示详细指南
     featured_platforms = ['deepseek', 'moonshot', 'volcengine', 'zhipu']
     for platform in featured_platforms:
         info = get_platform_info(platform)
         if info:
-            guide += f"\n🌟 {info['name']}:\n"
-            guide += _format_list(info['setup_steps']) + "\n"
+            parts.append(f"\n🌟 {info['name']}:\n")
+            parts.append(_format_list(info['setup_steps']) + "\n")
     
-    guide += """
+    parts.append("""
 🔧 常用命令:
 ====================================
 • llm-balance list              # 查看所有平台
@@ -238,15 +230,34 @@ def get_setup_guide() -> str:
 📝 完整文档:
 • GitHub: https://github.com/your-repo/llm-balance
 • Issues: https://github.com/your-repo/llm-balance/issues
-"""
+""")
     
-    return guide
+    return ''.join(parts)
+
+@lru_cache(maxsize=1)
+def _platform_env_vars() -> tuple:
+    """所有 (平台名, 环境变量名) 对 (注册表是静态的, 只需收集一次)"""
+    env_vars = []
+    for name in registry.list_platforms():
+        platform_info = registry.get_platform(name)
+        if platform_info and platform_info.env_var:
+            env_vars.append((name, platform_info.env_var))
+    return tuple(env_vars)
 
 def format_platform_summary() -> str:
     """格式化平台概览"""
-    enabled_platforms = _get_enabled_platforms()
+    # 一次遍历读取所有环境变量; 概览只取决于哪些已设置, 以此作为缓存键
+    environ = os.environ
+    env_state = tuple(bool(environ.get(env_var)) for _, env_var in _platform_env_vars())
+    return _format_platform_summary(env_state)
+
+@lru_cache(maxsize=4)
+def _format_platform_summary(env_state: tuple) -> str:
+    """生成平台概览文本 (env_state 与 _platform_env_vars 一一对应)"""
+    # 已启用平台: 环境变量已设置的平台, 直接复用 env_state 而不再逐个查询
+    enabled_platforms = [name for (name, _), is_set in zip(_platform_env_vars(), env_state) if is_set]
     
-    summary = f"""
+    parts = [f"""
 📊 LLM Balance Checker 平台概览
 
 ====================================
@@ -255,19 +266,19 @@ def format_platform_summary() -> str:
 {_format_platform_list(enabled_platforms, "已启用平台")}
 
 🔧 快速配置命令:
-"""
+"""]
     
     # 显示推荐平台的配置命令
     for platform in ['deepseek']:
         info = get_platform_info(platform)
         if info and not os.getenv(info['env_var']):
-            summary += f"""
+            parts.append(f"""
    # {info['name']}
    export {info['env_var']}="your_api_key"
    llm-balance enable {platform}
-"""
+""")
     
-    summary += """
+    parts.append("""
 
 📝 完整配置指南:
    llm-balance setup-guide
@@ -276,6 +287,6 @@ def format_platform_summary() -> str:
    llm-balance list     # 查看所有平台
    llm-balance cost     # 检查余额
    llm-balance rates    # 查看汇率
-"""
+""")
     
-    return summary
\ No newline at end of file
+    return ''.join(parts)
\ No newline at end of file
@@ -3,13 +3,13 @@ Main coding plan checker functionality
 """
 
 import json
-import threading
 from typing import List, Dict, Any, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from .config import ConfigManager
 from .platform_configs import PlatformConfig
 from .platform_handlers.base import BasePlatformHandler, CodingPlanInfo
-from .platform_handlers import create_handler
+from .platform_handlers import get_handler
+from .utils import MAX_WORKERS, map_concurrently, print_line
 
 class PlanChecker:
     """Main coding plan checker class"""
@@ -18,11 +18,7 @@ class PlanChecker:
         self.config_manager = ConfigManager(config_file)
         # Use provided browser or fall back to global configuration
         self.browser = browser or self.config_manager.get_global_browser()
-        self.handlers = {}
-        # Thread pool size for concurrent platform checking
-        self.max_workers = 5
-        # Thread lock for handler cache
-        self._handler_lock = threading.Lock()
+        self.max_workers = MAX_WORKERS
 
     def _check_single_plan(self, platform_config: PlatformConfig) -> Optional[Dict[str, Any]]:
         """Check coding plan for a single platform (thread-safe helper method)"""
@@ -55,7 +51,8 @@ class PlanChecker:
         plans = []
         platforms = self.config_manager.get_enabled_platforms()
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+        workers = max(1, min(len(platforms), self.max_workers))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
             future_to_platform = {
                 executor.submit(self._check_single_plan, config): config
                 for config in platforms
@@ -74,11 +71,15 @@ class PlanChecker:
         
         return plans
     
+    def check_platforms_plans(self, platform_names: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Check several named platforms concurrently, returning results in the given order"""
+        return map_concurrently(self.check_platform_plan, platform_names, self.max_workers)
+
     def check_platform_plan(self, platform_name: str) -> Optional[Dict[str, Any]]:
         """Check coding plan for a specific platform"""
         platform_config = self.config_manager.get_platform(platform_name)
         if not platform_config:
-            print(f"Platform {platform_name} not found in configuration")
+            print_line(f"Platform {platform_name} not found in configuration")
             return None
 
         try:
@@ -100,16 +101,12 @@ class PlanChecker:
                 'raw_data': plan_info.raw_data
             }
         except Exception as e:
-            print(f"Error checking coding plan for {platform_name}: {e}")
+            print_line(f"Error checking coding plan for {platform_name}: {e}")
             return None
     
     def _get_handler(self, config: PlatformConfig) -> BasePlatformHandler:
         """Get handler instance for platform configuration (thread-safe)"""
-        if config.name not in self.handlers:
-            with self._handler_lock:
-                if config.name not in self.handlers:
-                    self.handlers[config.name] = create_handler(config, self.browser)
-        return self.handlers[config.name]
+        return get_handler(config, self.browser)
 
     def format_plans(self, plans: List[Dict[str, Any]], format_type: str = 'table') -> str:
         """Format coding plan information with unified style"""
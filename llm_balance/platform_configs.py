@@ -3,14 +3,23 @@ Platform configuration management
 Default configurations are maintained in Python code, with generation to YAML
 """
 
+import hashlib
+import json
 import os
-import yaml
+import shutil
+import sys
 from typing import Dict, Any, List, Optional
 from pathlib import Path
+from copy import deepcopy
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 
-@dataclass
+# Slotted dataclasses need Python 3.10+; older interpreters keep the per-instance __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class PlatformConfig:
     """Platform configuration data class"""
     name: str
@@ -24,6 +33,9 @@ class PlatformConfig:
     # Display control options
     show_cost: bool = True
     show_package: bool = True
+
+    # Seconds to reuse cached cost and package/token results (0 disables the cache)
+    cache_ttl: int = 300
     
     # API configuration
     api_url: str = ""
@@ -55,6 +67,8 @@ class PlatformConfig:
     token: Optional[str] = None
     org_id: Optional[str] = None
     ingress_cookie: Optional[str] = None
+    # API key read from a platform side file (e.g. oneapi_config.yaml) when no env var is set
+    api_key: Optional[str] = None
     
     # Legacy compatibility fields
     balance_path: Optional[list] = None
@@ -74,6 +88,10 @@ class PlatformConfig:
         if self.balance_path is None:
             self.balance_path = []
     
+    def copy(self) -> 'PlatformConfig':
+        """Independent copy, including the headers/params/data containers handlers modify"""
+        return deepcopy(self)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
         result = {
@@ -88,6 +106,9 @@ class PlatformConfig:
             'show_package': self.show_package,
         }
 
+        if self.cache_ttl != 300:
+            result['cache_ttl'] = self.cache_ttl
+
         if self.env_var:
             result['env_var'] = self.env_var
             
@@ -154,6 +175,72 @@ class PlatformConfig:
         return cls(**data)
 
 
+# Config keys passed to PlatformConfig explicitly (or dropped) rather than as extra fields
+_PLATFORM_EXPLICIT_KEYS = frozenset(
+    ('name', 'display_name', 'handler_class', 'description', 'auth_type', 'enabled', 'user_id')
+)
+
+def _platform_from_dict(name: str, platform_name: str, config: Dict[str, Any]) -> PlatformConfig:
+    """Build a PlatformConfig from a merged config dict, with defaults derived from platform_name"""
+    title = platform_name.title()
+    return PlatformConfig(
+        name=name,
+        display_name=config.get('display_name', title),
+        handler_class=config.get('handler_class', f'{title}Handler'),
+        description=config.get('description', f'{title} platform'),
+        auth_type=config.get('auth_type', 'api_key'),
+        enabled=config.get('enabled', True),
+        **{k: v for k, v in config.items() if k not in _PLATFORM_EXPLICIT_KEYS}
+    )
+
+def _replace_file(path: str, content: str):
+    """Atomically replace path with content via a temp file and os.replace"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        # Keep the replaced file's permissions (e.g. a config chmod'ed 600) instead of the umask default
+        try:
+            shutil.copymode(path, tmp_path)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+@lru_cache(maxsize=1)
+def _yaml_codec():
+    """Import PyYAML on first use, returning (yaml, Loader, Dumper)
+    
+    Warm loads are served from the JSON parse cache, so most commands never
+    need YAML. The libyaml bindings parse and emit several times faster;
+    fall back to the pure-Python ones.
+    """
+    import yaml
+    try:
+        from yaml import CSafeLoader as loader, CSafeDumper as dumper
+    except ImportError:
+        from yaml import SafeLoader as loader, SafeDumper as dumper
+    return yaml, loader, dumper
+
+@lru_cache(maxsize=1)
+def _config_cache_dir() -> Path:
+    """Directory for the parsed-config JSON cache (resolved once per process)"""
+    return Path.home() / '.llm_balance' / 'cache'
+
+@lru_cache(maxsize=1)
+def _default_config_path() -> str:
+    """Resolve (and create the directory for) the default config file once per process"""
+    home = Path.home()
+    config_dir = home / '.llm_balance'
+    config_dir.mkdir(exist_ok=True)
+    return str(config_dir / 'config.yaml')
+
+
 class ConfigManager:
     """Simplified configuration manager using platform handlers"""
     
@@ -161,28 +248,90 @@ class ConfigManager:
         self.config_file = config_file or self._get_default_config_path()
         self.global_config: Dict[str, Any] = {'browser': 'chrome'}
         self.user_config: Dict[str, Any] = {}
+        # get_platform results by name; cleared whenever the configuration is loaded or saved
+        self._platform_cache: Dict[str, Optional[PlatformConfig]] = {}
+        # Nesting depth of `with config_manager:` blocks; saves inside them are deferred to the outermost exit
+        self._save_depth = 0
+        self._save_pending = False
         self.load_user_config()
+
+    def __enter__(self) -> 'ConfigManager':
+        """Batch mutations: save_config calls inside the block are coalesced into one write on exit"""
+        self._save_depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._save_depth -= 1
+        if self._save_depth == 0 and self._save_pending:
+            # Mutations already applied are persisted even if the block raised,
+            # as they would have been by immediate saves
+            self.save_config()
     
     def _get_default_config_path(self) -> str:
         """Get default configuration file path"""
-        home = Path.home()
-        config_dir = home / '.llm_balance'
-        config_dir.mkdir(exist_ok=True)
-        return str(config_dir / 'config.yaml')
+        return _default_config_path()
     
     def load_user_config(self):
         """Load user configuration from file"""
+        self._platform_cache.clear()
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f) or {}
-                self.user_config = config.get('platforms', {})
-                self.global_config['browser'] = config.get('browser', 'chrome')
+            config = self._read_config_file() or {}
+            self.user_config = config.get('platforms', {})
+            self.global_config['browser'] = config.get('browser', 'chrome')
         except FileNotFoundError:
             self.user_config = {}
         except Exception as e:
             print(f"Error loading user config: {e}")
             self.user_config = {}
     
+    def _read_config_file(self) -> Any:
+        """Parse the YAML config, reusing a JSON copy of the last parse while the file is unchanged
+        
+        config.yaml stays the only file users edit; the JSON copy lives under
+        ~/.llm_balance/cache and is keyed by the file's path, size and mtime.
+        """
+        stat = os.stat(self.config_file)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        cache_path = self._config_cache_path()
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = json.loads(f.read())
+            if cached.get('stamp') == stamp:
+                return cached['config']
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+
+        # Hand libyaml the raw bytes; it decodes UTF-8 itself without a Python text layer
+        yaml, loader, _ = _yaml_codec()
+        with open(self.config_file, 'rb') as f:
+            config = yaml.load(f, Loader=loader)
+
+        self._store_config_cache(cache_path, stamp, config)
+        return config
+
+    def _config_cache_path(self) -> Path:
+        """JSON parse cache for this config file, keyed by its resolved path"""
+        real_path = os.path.realpath(self.config_file)
+        return _config_cache_dir() / f"config-{hashlib.sha1(real_path.encode('utf-8')).hexdigest()[:16]}.json"
+
+    def _store_config_cache(self, cache_path: Path, stamp: List[int], config: Any):
+        """Write the parse cache; failures only cost the next load a YAML parse"""
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            # Only cache documents JSON reproduces exactly (no dates, non-string keys, ...)
+            encoded = json.dumps({'stamp': stamp, 'config': config}, ensure_ascii=False)
+            if json.loads(encoded)['config'] != config:
+                return
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(encoded)
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError):
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
     def get_platform_config(self, platform_name: str) -> Optional[Dict[str, Any]]:
         """Get platform configuration directly from handler"""
         from .platform_handlers.registry import registry
@@ -214,38 +363,81 @@ class ConfigManager:
             return None
     
     def save_config(self):
-        """Save configuration to file"""
+        """Save configuration to file
+        
+        Inside a `with config_manager:` block the write is deferred to the block's
+        exit. The file is left untouched when its content would not change, and is
+        otherwise replaced atomically so readers never see a partial file.
+        """
+        self._platform_cache.clear()
+        if self._save_depth:
+            self._save_pending = True
+            return
+        self._save_pending = False
+
         config = {
             'browser': self.global_config.get('browser', 'chrome'),
             'platforms': self.user_config
         }
-        
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
+        yaml, _, dumper = _yaml_codec()
+        content = yaml.dump(config, Dumper=dumper, default_flow_style=False, allow_unicode=True)
+
+        # Write through symlinks (e.g. a config kept in a dotfiles repo) rather than replacing them
+        path = os.path.realpath(self.config_file)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                if f.read() == content:
+                    return
+        except (OSError, UnicodeDecodeError):
+            pass
+
+        _replace_file(path, content)
+
+        # Seed the parse cache with what was just written, so the next load skips YAML too
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        self._store_config_cache(self._config_cache_path(), [stat.st_mtime_ns, stat.st_size], config)
     
     def get_platform(self, name: str) -> Optional[PlatformConfig]:
-        """Get platform configuration by name"""
+        """Get platform configuration by name
+        
+        The merged config is built once per name; each caller gets its own copy,
+        so changes made to one (e.g. handler overrides) never leak into later calls.
+        """
+        try:
+            platform_config = self._platform_cache[name]
+        except KeyError:
+            platform_config = self._platform_cache[name] = self._build_platform(name)
+        return platform_config.copy() if platform_config is not None else None
+
+    def _build_platform(self, name: str) -> Optional[PlatformConfig]:
+        """Merge handler defaults with user overrides into a PlatformConfig"""
         config_dict = self.get_platform_config(name)
         if config_dict is None:
             return None
         
         # Convert dict to PlatformConfig
-        return PlatformConfig(
-            name=config_dict.get('name', name),
-            display_name=config_dict.get('display_name', name.title()),
-            handler_class=config_dict.get('handler_class', f'{name.title()}Handler'),
-            description=config_dict.get('description', f'{name.title()} platform'),
-            auth_type=config_dict.get('auth_type', 'api_key'),
-            enabled=config_dict.get('enabled', True),
-            **{k: v for k, v in config_dict.items() if k not in ['name', 'display_name', 'handler_class', 'description', 'auth_type', 'enabled', 'user_id']}
-        )
+        return _platform_from_dict(config_dict.get('name', name), name, config_dict)
 
     def update_platform(self, name: str, config: Dict[str, Any]):
         """Update platform configuration"""
-        if name not in self.user_config:
-            self.user_config[name] = {}
-        self.user_config[name].update(config)
-        self.save_config()
+        if self._merge_platform(name, config):
+            self.save_config()
+
+    def _merge_platform(self, name: str, overrides: Dict[str, Any]) -> bool:
+        """Merge overrides into a platform's user config, returning whether anything changed"""
+        platform_config = self.user_config.get(name)
+        if platform_config is None and name not in self.user_config:
+            self.user_config[name] = dict(overrides)
+            return True
+        changed = False
+        for key, value in overrides.items():
+            if key not in platform_config or platform_config[key] != value:
+                platform_config[key] = value
+                changed = True
+        return changed
 
     def get_global_browser(self) -> str:
         """Get global browser configuration"""
@@ -288,32 +480,21 @@ class ConfigManager:
             config = self.get_platform_config(platform_name)
             if config and config.get('enabled', True):
                 # Create PlatformConfig object
-                platform_config = PlatformConfig(
-                    name=platform_name,
-                    display_name=config.get('display_name', platform_name.title()),
-                    handler_class=config.get('handler_class', f'{platform_name.title()}Handler'),
-                    description=config.get('description', f'{platform_name.title()} platform'),
-                    auth_type=config.get('auth_type', 'api_key'),
-                    enabled=config.get('enabled', True),
-                    **{k: v for k, v in config.items() if k not in ['name', 'display_name', 'handler_class', 'description', 'auth_type', 'enabled', 'user_id']}
-                )
-                enabled_platforms.append(platform_config)
+                enabled_platforms.append(_platform_from_dict(platform_name, platform_name, config))
         
         return enabled_platforms
     
     def enable_platform(self, platform_name: str):
         """Enable a platform"""
-        if platform_name not in self.user_config:
-            self.user_config[platform_name] = {}
-        self.user_config[platform_name]['enabled'] = True
-        self.save_config()
+        # Already enabled platforms leave the config (and the file) untouched
+        if self._merge_platform(platform_name, {'enabled': True}):
+            self.save_config()
     
     def disable_platform(self, platform_name: str):
         """Disable a platform"""
-        if platform_name not in self.user_config:
-            self.user_config[platform_name] = {}
-        self.user_config[platform_name]['enabled'] = False
-        self.save_config()
+        # Already disabled platforms leave the config (and the file) untouched
+        if self._merge_platform(platform_name, {'enabled': False}):
+            self.save_config()
     
     def get_global_config(self) -> Dict[str, Any]:
         """Get global configuration"""
@@ -321,6 +502,9 @@ class ConfigManager:
     
     def set_global_config(self, key: str, value: Any):
         """Set global configuration"""
+        # Re-setting the current value (e.g. the same browser) leaves the file alone
+        if key in self.global_config and self.global_config[key] == value:
+            return
         self.global_config[key] = value
         self.save_config()
     
@@ -349,7 +533,14 @@ class ConfigManager:
             except Exception as e:
                 print(f"Warning: Failed to generate config for {name}: {e}")
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
+        yaml, _, dumper = _yaml_codec()
+        content = yaml.dump(config, Dumper=dumper, default_flow_style=False, allow_unicode=True)
+        # Usually overwrites the live config.yaml, so never leave it half-written
+        output_path = os.path.realpath(output_file)
+        _replace_file(output_path, content)
+        if output_path == os.path.realpath(self.config_file):
+            # The generated file is large; let the next load read it from the JSON cache
+            stat = os.stat(output_path)
+            self._store_config_cache(self._config_cache_path(), [stat.st_mtime_ns, stat.st_size], config)
         
         return output_file
@@ -2,12 +2,20 @@
 Platform handlers for different LLM services
 """
 
+import threading
+from collections import OrderedDict
+
 from .registry import registry
 
+# Process-wide handler cache shared by the balance, token and plan checkers
+_HANDLER_CACHE_SIZE = 64
+_handler_cache = OrderedDict()
+_handler_cache_lock = threading.Lock()
+
 def create_handler(config, browser: str = 'chrome'):
     """Factory function to create platform handlers using Python-based configuration"""
-    # Get handler class from registry
-    handler_class = registry.get_handler_class(config.name.lower())
+    # Get handler class from registry (a dict lookup; the registry lower-cases the name)
+    handler_class = registry.get_handler_class(config.name)
     if handler_class:
         try:
             return handler_class(config, browser)
@@ -16,3 +24,29 @@ def create_handler(config, browser: str = 'chrome'):
     
     # No fallback - platform must be explicitly supported
     raise ValueError(f"Unsupported platform: {config.name}")
+
+def get_handler(config, browser: str = 'chrome'):
+    """Get the shared handler for a platform configuration and browser
+    
+    Handlers are cached per process (LRU, keyed by platform, browser and the full
+    configuration), so every checker reuses the same handler and its auth state
+    and keep-alive connections instead of building its own. Each handler is built
+    from its own copy of the configuration: many handlers apply env/side-file
+    overrides to self.config in __init__, which must not change the caller's
+    object or the key it is cached under.
+    """
+    key = (config.name, browser, repr(config))
+    with _handler_cache_lock:
+        handler = _handler_cache.get(key)
+        if handler is not None:
+            _handler_cache.move_to_end(key)
+            return handler
+
+    # Create outside the lock so a slow handler doesn't block other platforms
+    handler = create_handler(config.copy(), browser)
+    with _handler_cache_lock:
+        handler = _handler_cache.setdefault(key, handler)
+        _handler_cache.move_to_end(key)
+        if len(_handler_cache) > _HANDLER_CACHE_SIZE:
+            _handler_cache.popitem(last=False)
+    return handler
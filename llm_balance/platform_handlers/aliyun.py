@@ -4,23 +4,48 @@ Aliyun platform handler using official SDK
 
 import json
 import os
+import threading
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from .base import BasePlatformHandler, CostInfo, PlatformTokenInfo, ModelTokenInfo
 from ..config import PlatformConfig
 
 try:
-    from aliyunsdkcore.client import AcsClient
-    from aliyunsdkcore.acs_exception.exceptions import ServerException, ClientException
-    from aliyunsdkbssopenapi.request.v20171214.QueryAccountBalanceRequest import QueryAccountBalanceRequest
-    from aliyunsdkbssopenapi.request.v20171214.QueryAccountTransactionsRequest import QueryAccountTransactionsRequest
-    from datetime import datetime, timedelta
-    SDK_AVAILABLE = True
-except ImportError:
-    SDK_AVAILABLE = False
+    import orjson
+    # Parses the SDK's response bytes directly
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; json.loads accepts bytes too
+    _json_loads = json.loads
+
+# The Aliyun SDK is slow to import and this module is loaded for platform defaults on
+# every run, so it is imported on first use (see _ensure_sdk); None means not tried yet
+SDK_AVAILABLE = None
+AcsClient = ServerException = ClientException = None
+QueryAccountBalanceRequest = QueryAccountTransactionsRequest = None
+
+def _ensure_sdk() -> bool:
+    """Import the Aliyun SDK on first use, returning whether it is available"""
+    global SDK_AVAILABLE, AcsClient, ServerException, ClientException
+    global QueryAccountBalanceRequest, QueryAccountTransactionsRequest
+    if SDK_AVAILABLE is None:
+        try:
+            from aliyunsdkcore.client import AcsClient
+            from aliyunsdkcore.acs_exception.exceptions import ServerException, ClientException
+            from aliyunsdkbssopenapi.request.v20171214.QueryAccountBalanceRequest import QueryAccountBalanceRequest
+            from aliyunsdkbssopenapi.request.v20171214.QueryAccountTransactionsRequest import QueryAccountTransactionsRequest
+            SDK_AVAILABLE = True
+        except ImportError:
+            SDK_AVAILABLE = False
+    return SDK_AVAILABLE
 
 class AliyunHandler(BasePlatformHandler):
     """Aliyun platform cost handler using official SDK"""
     
+    # SDK clients shared across calls and handler instances, keyed by credentials and region,
+    # so the balance, transaction and token queries reuse one signer and connection pool
+    _clients: Dict[tuple, Any] = {}
+    _clients_lock = threading.Lock()
+    
     @classmethod
     def get_default_config(cls) -> dict:
         """Get default configuration for Aliyun platform"""
@@ -61,9 +86,21 @@ class AliyunHandler(BasePlatformHandler):
         super().__init__(browser)
         self.config = config
     
+    @classmethod
+    def _get_client(cls, access_key_id: str, access_key_secret: str, region: str = 'cn-hangzhou'):
+        """Get the shared AcsClient for a set of credentials, creating it on first use"""
+        key = (access_key_id, access_key_secret, region)
+        client = cls._clients.get(key)
+        if client is None:
+            with cls._clients_lock:
+                client = cls._clients.get(key)
+                if client is None:
+                    client = cls._clients[key] = AcsClient(access_key_id, access_key_secret, region)
+        return client
+    
     def get_balance(self) -> CostInfo:
         """Get cost information from Aliyun using official SDK"""
-        if not SDK_AVAILABLE:
+        if not _ensure_sdk():
             raise ValueError("Aliyun SDK not available. Please install with: pip install aliyun-python-sdk-bssopenapi")
         
         # Check for required environment variables
@@ -76,8 +113,8 @@ class AliyunHandler(BasePlatformHandler):
         if not access_key_secret:
             raise ValueError("Aliyun Access Key Secret not found. Please set ALIYUN_ACCESS_KEY_SECRET environment variable.")
         
-        # Create client
-        client = AcsClient(access_key_id, access_key_secret, 'cn-hangzhou')
+        # Reuse the shared client
+        client = self._get_client(access_key_id, access_key_secret)
         
         # Create request
         request = QueryAccountBalanceRequest()
@@ -88,8 +125,7 @@ class AliyunHandler(BasePlatformHandler):
             response = client.do_action_with_exception(request)
             
             # Parse response
-            import json
-            response_data = json.loads(response.decode('utf-8'))
+            response_data = _json_loads(response)
             
             # Extract balance and currency from response
             balance = self._extract_balance(response_data)
@@ -132,14 +168,14 @@ class AliyunHandler(BasePlatformHandler):
     def _get_spent_from_transaction_details(self) -> float:
         """Get actual spent amount from transaction details API"""
         try:
-            # Create client
+            # Reuse the shared client
             access_key_id = os.getenv(self.config.env_var or 'ALIYUN_ACCESS_KEY_ID')
             access_key_secret = os.getenv('ALIYUN_ACCESS_KEY_SECRET')
             
             if not access_key_id or not access_key_secret:
                 return 0.0
             
-            client = AcsClient(access_key_id, access_key_secret, 'cn-hangzhou')
+            client = self._get_client(access_key_id, access_key_secret)
             
             # Try to get transaction details for the last 6 months
             now = datetime.now()
@@ -182,7 +218,7 @@ class AliyunHandler(BasePlatformHandler):
                     request.set_PageSize(100)
                     # Send request
                     response = client.do_action_with_exception(request)
-                    response_data = json.loads(response.decode('utf-8'))
+                    response_data = _json_loads(response)
                     # Extract transaction details - use correct path based on actual API response
                     transactions = []
                     
@@ -273,7 +309,7 @@ class AliyunHandler(BasePlatformHandler):
     
     def get_model_tokens(self) -> PlatformTokenInfo:
         """Get model-level token information from Aliyun using official SDK"""
-        if not SDK_AVAILABLE:
+        if not _ensure_sdk():
             raise ValueError("Aliyun SDK not available. Please install with: pip install aliyun-python-sdk-bssopenapi")
         
         # Check for required environment variables
@@ -286,8 +322,8 @@ class AliyunHandler(BasePlatformHandler):
         if not access_key_secret:
             raise ValueError("Aliyun Access Key Secret not found. Please set ALIYUN_ACCESS_KEY_SECRET environment variable.")
         
-        # Create client
-        client = AcsClient(access_key_id, access_key_secret, 'cn-hangzhou')
+        # Reuse the shared client
+        client = self._get_client(access_key_id, access_key_secret)
         
         # Create request - Note: Aliyun may not have a direct token API
         # This is a placeholder for token checking
@@ -299,8 +335,7 @@ class AliyunHandler(BasePlatformHandler):
             response = client.do_action_with_exception(request)
             
             # Parse response
-            import json
-            response_data = json.loads(response.decode('utf-8'))
+            response_data = _json_loads(response)
             
             # Extract model-level token data
             model_tokens = self._extract_model_tokens(response_data)
@@ -43,16 +43,13 @@ class AnthropicHandler(BasePlatformHandler):
         if not self.config.api_url:
             raise ValueError("No API URL configured for Anthropic")
         
-        # Prepare authentication
-        headers = self.config.headers.copy() if self.config.headers else {}
-        
         # Get API key from environment variable
         api_key = os.getenv(self.config.env_var or 'ANTHROPIC_API_KEY')
         
         if not api_key:
             raise ValueError("Anthropic API key required. Set ANTHROPIC_API_KEY environment variable.")
         
-        headers['x-api-key'] = api_key
+        headers = self._prepare_headers({'x-api-key': api_key})
         
         # Note: Anthropic's API doesn't have a direct balance endpoint
         # We'll need to use a different approach or work with usage statistics
@@ -2,10 +2,92 @@
 Base handler for platform cost checking
 """
 
+import random
+import re
+import threading
+import time
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List, Union
 from dataclasses import dataclass, field
 
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+# Authentication error phrases per response field, each compiled into one case-insensitive pattern
+_AUTH_ERROR_PATTERNS = tuple(
+    (field, re.compile('|'.join(map(re.escape, phrases)), re.IGNORECASE))
+    for field, phrases in (
+        ('code', ('ConsoleNeedLogin', 'Unauthorized', 'AuthenticationFailed', 'InvalidToken', 'InvalidCSRFToken')),
+        ('message', ('needLogin', 'unauthorized', 'authentication failed', 'invalid token', 'login required')),
+        ('error', ('Unauthorized', 'AuthenticationError', 'InvalidToken')),
+    )
+)
+
+# Known pycookiecheat failures, matched in one search; the named group picks the hint
+_COOKIE_ERROR_PATTERN = re.compile(
+    r'(?P<browser>is not a valid BrowserType)|(?P<profile>No such file or directory)'
+)
+
+def _parse_json_response(response):
+    """Decode a JSON response body, with orjson when it is installed"""
+    if orjson is not None:
+        try:
+            # Parses the raw bytes directly instead of decoding to str first
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            # Non-UTF-8 or invalid body: requests detects the encoding and raises its usual error
+            pass
+    return response.json()
+
+# Transient HTTP statuses retried by _make_request, with capped exponential backoff
+_RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+_RETRY_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 0.5
+_RETRY_MAX_DELAY = 4.0
+# Methods safe to resend by default; other requests are retried only when the caller marks them idempotent
+_IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+def _retry_delay(response, attempt: int) -> float:
+    """Seconds to wait before retrying: the server's Retry-After if given, else backoff"""
+    try:
+        delay = float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        # Missing or an HTTP date: exponential backoff with a little jitter
+        delay = _RETRY_BASE_DELAY * 2 ** attempt + random.random() * 0.1
+    return min(max(delay, 0.0), _RETRY_MAX_DELAY)
+
+# Browser cookies per (browser, domain), filled by BasePlatformHandler._get_cookies
+_COOKIE_CACHE: Dict[tuple, Dict[str, str]] = {}
+
+# Process-wide keep-alive HTTP session shared by every handler (and every checker),
+# so a host contacted once - e.g. by the cost check - is reused by the package/plan checks
+_SHARED_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+def _get_shared_session():
+    """Get the shared HTTP session, creating it on first use"""
+    global _SHARED_SESSION
+    if _SHARED_SESSION is not None:
+        return _SHARED_SESSION
+
+    with _SESSION_LOCK:
+        if _SHARED_SESSION is None:
+            import requests
+            from http.cookiejar import DefaultCookiePolicy
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            # One pool per platform host; a few connections each for handlers that fan out
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=8)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            # Only reuse connections: don't carry server-set cookies between requests or platforms
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            _SHARED_SESSION = session
+        return _SHARED_SESSION
+
 @dataclass
 class CostInfo:
     platform: str
@@ -53,9 +135,27 @@ class CodingPlanInfo:
 class BasePlatformHandler(ABC):
     """Base class for platform cost handlers"""
 
+    # Optional whitelist of raw_data fields to keep in token output (see token_checker._project_raw)
+    raw_data_projection: Optional[Dict[str, Any]] = None
+
     def __init__(self, browser='chrome'):
         self.browser = browser
 
+    def _prepare_headers(self, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Build request headers: the configured headers plus extra (e.g. auth) headers
+        
+        Built in one step instead of copy-then-assign. With nothing to add the configured
+        headers are returned as-is, so callers must not mutate the result.
+        """
+        headers = getattr(self.config, 'headers', None) or {}
+        if not extra:
+            return headers
+        return {**headers, **extra}
+
+    def _get_session(self):
+        """Get the keep-alive HTTP session so repeated requests reuse connections and TLS"""
+        return _get_shared_session()
+
     def _validate_balance(self, balance: float, field_name: str = "balance") -> float:
         """验证余额值，确保其合理性"""
         if balance is None:
@@ -79,6 +179,11 @@ class BasePlatformHandler(ABC):
 
         return balance_float
         
+    def _normalize_currency(self, currency: Any) -> str:
+        """Upper-case a currency code, skipping the copy when it is already upper case"""
+        currency = str(currency)
+        return currency if currency.isupper() else currency.upper()
+
     @abstractmethod
     def get_balance(self) -> CostInfo:
         """Get cost information for the platform"""
@@ -107,7 +212,22 @@ class BasePlatformHandler(ABC):
         # Check if browser is None (non-cookie authentication)
         if self.browser is None:
             raise ValueError(f"This platform doesn't use cookie-based authentication. Please check your API key configuration.")
-        
+
+        # Several platforms (and the cost/package/plan checks of one platform) share a
+        # cookie domain; read the browser's cookie store once per domain per process
+        key = (self.browser.lower(), domain)
+        cookies = _COOKIE_CACHE.get(key)
+        if cookies is None:
+            cookies = self._read_browser_cookies(domain, silent)
+            if not cookies:
+                # Not logged in yet: don't cache, so the next check reads the store again
+                return cookies
+            _COOKIE_CACHE[key] = cookies
+        # Callers may add to the dict, so hand out copies
+        return dict(cookies)
+
+    def _read_browser_cookies(self, domain: str, silent: bool = True) -> Dict[str, str]:
+        """Read cookies for domain from the browser's cookie store (uncached, see _get_cookies)"""
         try:
             import pycookiecheat
             from pycookiecheat.common import BrowserType
@@ -178,9 +298,11 @@ class BasePlatformHandler(ABC):
             raise ValueError(f"pycookiecheat library not found. Please install it with: pip install pycookiecheat")
         except Exception as e:
             # Check for common browser issues
-            if "is not a valid BrowserType" in str(e):
+            match = _COOKIE_ERROR_PATTERN.search(str(e))
+            kind = match.lastgroup if match else None
+            if kind == 'browser':
                 raise ValueError(f"Browser '{self.browser}' is not supported. Try: {', '.join(browser_mapping.keys())}")
-            elif "No such file or directory" in str(e):
+            elif kind == 'profile':
                 raise ValueError(f"Browser profile not found for {self.browser}. Please ensure {self.browser} is installed and running.")
             else:
                 raise ValueError(f"Failed to get cookies for {domain}: {e}. Please ensure you are logged in to {domain} in {self.browser} browser.")
@@ -345,7 +467,6 @@ class BasePlatformHandler(ABC):
     
     def _generate_host_keys(self, domain: str):
         """Generate host keys for domain matching"""
-        import re
         from urllib.parse import urlparse
         
         # Extract domain from URL if needed
@@ -366,71 +487,65 @@ class BasePlatformHandler(ABC):
                      cookies: Optional[Dict] = None,
                      data: Optional[Dict] = None,
                      params: Optional[Dict] = None,
-                     proxies: Optional[Dict] = None) -> Optional[Dict]:
-        """Make HTTP request with error handling"""
+                     proxies: Optional[Dict] = None,
+                     idempotent: Optional[bool] = None) -> Optional[Dict]:
+        """Make HTTP request with error handling
+        
+        Transient 429/5xx responses are retried for GET/HEAD/OPTIONS. Pass
+        idempotent=True for a POST that only queries (e.g. a billing lookup);
+        anything else, such as a billed generation call, is sent exactly once.
+        """
         import requests
         
+        session = self._get_session()
+        if idempotent is None:
+            idempotent = method.upper() in _IDEMPOTENT_METHODS
+        attempts = _RETRY_ATTEMPTS if idempotent else 1
         try:
             # For GET requests, use params instead of json
             if method.upper() == 'GET' and params:
-                response = requests.request(
-                    method=method,
-                    url=url,
-                    headers=headers or {},
-                    cookies=cookies or {},
-                    params=params,
-                    timeout=20,
-                    proxies=proxies
-                )
+                body = {'params': params}
             elif method.upper() == 'GET' and data:
                 # Fallback for backward compatibility
-                response = requests.request(
-                    method=method,
-                    url=url,
-                    headers=headers or {},
-                    cookies=cookies or {},
-                    params=data,
-                    timeout=20,
-                    proxies=proxies
-                )
+                body = {'params': data}
             else:
-                response = requests.request(
+                body = {'json': data}
+
+            for attempt in range(attempts):
+                response = session.request(
                     method=method,
                     url=url,
                     headers=headers or {},
                     cookies=cookies or {},
-                    json=data,
                     timeout=20,
-                    proxies=proxies
+                    proxies=proxies,
+                    **body
                 )
+                # Rate limits and gateway hiccups are usually gone a moment later
+                if response.status_code not in _RETRY_STATUSES or attempt == attempts - 1:
+                    break
+                time.sleep(_retry_delay(response, attempt))
             
             # Check for HTTP errors
             response.raise_for_status()
             
             # Parse JSON response
-            result = response.json()
+            result = _parse_json_response(response)
             
             # Check for authentication/authorization errors in response
             if isinstance(result, dict):
                 # Common authentication error patterns
-                error_patterns = [
-                    ('code', ['ConsoleNeedLogin', 'Unauthorized', 'AuthenticationFailed', 'InvalidToken', 'InvalidCSRFToken']),
-                    ('message', ['needLogin', 'unauthorized', 'authentication failed', 'invalid token', 'login required']),
-                    ('error', ['Unauthorized', 'AuthenticationError', 'InvalidToken']),
-                    ('success', [False])
-                ]
-                
-                for field, patterns in error_patterns:
-                    if field in result:
-                        value = result[field]
-                        if isinstance(value, str) and any(pattern.lower() in value.lower() for pattern in patterns):
-                            raise ValueError(f"Authentication failed: {value}. Please ensure you are logged in and try again.")
-                        elif isinstance(value, bool) and not value and field == 'success':
-                            # Check if there's an error message
-                            if 'message' in result:
-                                raise ValueError(f"Request failed: {result['message']}")
-                            elif 'error' in result:
-                                raise ValueError(f"Request failed: {result['error']}")
+                for field, pattern in _AUTH_ERROR_PATTERNS:
+                    value = result.get(field)
+                    if isinstance(value, str) and pattern.search(value):
+                        raise ValueError(f"Authentication failed: {value}. Please ensure you are logged in and try again.")
+
+                if result.get('success') is False:
+                    # Check if there's an error message
+                    if 'message' in result:
+                        raise ValueError(f"Request failed: {result['message']}")
+                    elif 'error' in result:
+                        raise ValueError(f"Request failed: {result['error']}")
             
             return result
             
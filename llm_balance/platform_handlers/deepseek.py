@@ -3,7 +3,7 @@ DeepSeek platform handler
 """
 
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from .base import BasePlatformHandler, CostInfo, PlatformTokenInfo, ModelTokenInfo
 from ..config import PlatformConfig
 
@@ -86,16 +86,13 @@ class DeepSeekHandler(BasePlatformHandler):
         if not self.config.api_url:
             raise ValueError("No API URL configured for DeepSeek")
         
-        # Prepare authentication
-        headers = self.config.headers.copy() if self.config.headers else {}
-        
         # Get API key from environment variable
         api_key = os.getenv(self.config.env_var or 'DEEPSEEK_API_KEY')
         
         if not api_key:
             raise ValueError("DeepSeek API key required. Set DEEPSEEK_API_KEY environment variable.")
         
-        headers['Authorization'] = f'Bearer {api_key}'
+        headers = self._prepare_headers({'Authorization': f'Bearer {api_key}'})
         
         # Make API request
         response = self._make_request(
@@ -108,8 +105,7 @@ class DeepSeekHandler(BasePlatformHandler):
             raise ValueError("No response from DeepSeek API")
         
         # Extract balance and currency from response
-        balance = self._extract_balance(response)
-        currency = self._extract_currency(response)
+        balance, currency = self._extract_cost(response)
         
         # Try to get spent information using console token
         spent = self._get_spent_with_console_token()
@@ -127,24 +123,18 @@ class DeepSeekHandler(BasePlatformHandler):
         """Get platform display name"""
         return "DeepSeek"
     
-    def _extract_balance(self, response: Dict[str, Any]) -> Optional[float]:
-        """Extract balance from DeepSeek API response"""
-        balance_infos = response.get('balance_infos', [])
-        if balance_infos:
-            total_balance = balance_infos[0].get('total_balance', '0')
-            try:
-                balance_float = float(total_balance)
-                return self._validate_balance(balance_float, "total_balance")
-            except (ValueError, TypeError):
-                return None
-        return 0.0
-    
-    def _extract_currency(self, response: Dict[str, Any]) -> Optional[str]:
-        """Extract currency from DeepSeek API response"""
-        balance_infos = response.get('balance_infos', [])
-        if balance_infos:
-            return balance_infos[0].get('currency', 'CNY')
-        return 'CNY'
+    def _extract_cost(self, response: Dict[str, Any]) -> Tuple[Optional[float], str]:
+        """Extract (balance, currency) from DeepSeek API response"""
+        # Both come from the first balance_infos entry, so look it up once
+        balance_info = next(iter(response.get('balance_infos') or ()), None)
+        if balance_info is None:
+            return 0.0, 'CNY'
+        currency = balance_info.get('currency', 'CNY')
+        try:
+            balance_float = float(balance_info.get('total_balance', '0'))
+        except (ValueError, TypeError):
+            return None, currency
+        return self._validate_balance(balance_float, "total_balance"), currency
 
     def _get_balance_with_enhanced_spent(self, console_token: str) -> CostInfo:
         """Get balance using API key and enhanced spent calculation from invoices"""
@@ -192,8 +182,7 @@ class DeepSeekHandler(BasePlatformHandler):
             raise ValueError("No API URL configured for DeepSeek")
 
         # Prepare authentication
-        headers = self.config.headers.copy() if self.config.headers else {}
-        headers['Authorization'] = f'Bearer {api_key}'
+        headers = self._prepare_headers({'Authorization': f'Bearer {api_key}'})
 
         # Make API request
         response = self._make_request(
@@ -206,8 +195,7 @@ class DeepSeekHandler(BasePlatformHandler):
             raise ValueError("No response from DeepSeek API")
 
         # Extract balance and currency from response
-        balance = self._extract_balance(response)
-        currency = self._extract_currency(response)
+        balance, currency = self._extract_cost(response)
 
         return CostInfo(
             platform=self.get_platform_name(),
@@ -109,8 +109,9 @@ class FastGPTHandler(BasePlatformHandler):
 
         for field in balance_fields:
             if field in data:
+                raw = data[field]
                 try:
-                    balance_value = float(data[field])
+                    balance_value = float(raw)
                     return self._validate_balance(balance_value, field)
                 except (ValueError, TypeError):
                     continue
@@ -120,8 +121,9 @@ class FastGPTHandler(BasePlatformHandler):
             user_data = data['user']
             for field in balance_fields:
                 if field in user_data:
+                    raw = user_data[field]
                     try:
-                        balance_value = float(user_data[field])
+                        balance_value = float(raw)
                         return self._validate_balance(balance_value, f"user.{field}")
                     except (ValueError, TypeError):
                         continue
@@ -137,14 +139,16 @@ class FastGPTHandler(BasePlatformHandler):
 
         for field in currency_fields:
             if field in data:
-                return str(data[field]).upper()
+                raw = data[field]
+                return self._normalize_currency(raw)
 
         # Try nested fields
         if 'user' in data:
             user_data = data['user']
             for field in currency_fields:
                 if field in user_data:
-                    return str(user_data[field]).upper()
+                    raw = user_data[field]
+                    return self._normalize_currency(raw)
 
         # Default to USD for FastGPT
         return 'USD'
@@ -192,8 +196,9 @@ class FastGPTHandler(BasePlatformHandler):
 
             for field in spent_fields:
                 if field in data:
+                    raw = data[field]
                     try:
-                        spent_value = float(data[field])
+                        spent_value = float(raw)
                         return self._validate_balance(spent_value, field)
                     except (ValueError, TypeError):
                         continue
@@ -203,8 +208,9 @@ class FastGPTHandler(BasePlatformHandler):
                 stats_data = data['statistics']
                 for field in spent_fields:
                     if field in stats_data:
+                        raw = stats_data[field]
                         try:
-                            spent_value = float(stats_data[field])
+                            spent_value = float(raw)
                             return self._validate_balance(spent_value, f"statistics.{field}")
                         except (ValueError, TypeError):
                             continue
@@ -366,8 +372,9 @@ class FastGPTHandler(BasePlatformHandler):
         """Extract token value from data using multiple possible field names"""
         for field in field_names:
             if field in data:
+                raw = data[field]
                 try:
-                    value = float(data[field])
+                    value = float(raw)
                     return max(0.0, value)  # Ensure non-negative
                 except (ValueError, TypeError):
                     continue
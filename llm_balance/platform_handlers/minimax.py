@@ -8,6 +8,9 @@ from typing import Optional
 from .base import BasePlatformHandler, CostInfo, PlatformTokenInfo
 from ..config import PlatformConfig
 
+# Balance field names tried in order on the balance response
+_BALANCE_FIELDS = ('available_amount', 'balance', 'available', 'amount')
+
 class MiniMaxHandler(BasePlatformHandler):
     """MiniMax platform cost handler"""
 
@@ -119,8 +122,7 @@ class MiniMaxHandler(BasePlatformHandler):
     def _get_balance_amount(self) -> Optional[float]:
         """Get balance amount from MiniMax balance endpoint"""
         try:
-            headers = self.config.headers.copy() if self.config.headers else {}
-            headers['Authorization'] = f'Bearer {self.bearer_token}'
+            headers = self._prepare_headers({'Authorization': f'Bearer {self.bearer_token}'})
 
             # Add query parameter for group_id
             url = f"{self.config.balance_url}?GroupId={self.group_id}"
@@ -140,11 +142,11 @@ class MiniMaxHandler(BasePlatformHandler):
 
             if isinstance(data, dict):
                 # Try different field names for balance
-                balance_fields = ['available_amount', 'balance', 'available', 'amount']
-                for field in balance_fields:
+                for field in _BALANCE_FIELDS:
                     if field in data:
+                        raw = data[field]
                         try:
-                            balance_value = float(data[field])
+                            balance_value = float(raw)
                             return self._validate_balance(balance_value, field)
                         except (ValueError, TypeError):
                             continue
@@ -346,7 +346,9 @@ class MoonshotHandler(BasePlatformHandler):
             method='POST',
             headers=headers,
             cookies=cookies,
-            data=data
+            data=data,
+            # Read-only billing query, safe to retry
+            idempotent=True
         )
 
         if not response:
@@ -432,7 +434,9 @@ class MoonshotHandler(BasePlatformHandler):
             method='POST',
             headers=headers,
             cookies=cookies,
-            data=data
+            data=data,
+            # Read-only billing query, safe to retry
+            idempotent=True
         )
 
         if not response:
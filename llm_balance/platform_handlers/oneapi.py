@@ -73,9 +73,6 @@ class OneAPIHandler(BasePlatformHandler):
         if not self.config.api_url:
             raise ValueError("No API URL configured for One-API")
 
-        # Prepare authentication
-        headers = self.config.headers.copy() if self.config.headers else {}
-
         # Get API key from environment variable or config
         api_key = os.getenv(self.config.env_var or 'ONEAPI_API_KEY')
         if not api_key and hasattr(self.config, 'api_key'):
@@ -84,7 +81,7 @@ class OneAPIHandler(BasePlatformHandler):
         if not api_key:
             raise ValueError("One-API API key required. Set ONEAPI_API_KEY environment variable or configure in oneapi_config.yaml")
 
-        headers['Authorization'] = f'Bearer {api_key}'
+        headers = self._prepare_headers({'Authorization': f'Bearer {api_key}'})
 
         # Make API request for user info
         response = self._make_request(
@@ -122,8 +119,9 @@ class OneAPIHandler(BasePlatformHandler):
 
         for field in balance_fields:
             if field in data:
+                raw = data[field]
                 try:
-                    balance_value = float(data[field])
+                    balance_value = float(raw)
                     return self._validate_balance(balance_value, field)
                 except (ValueError, TypeError):
                     continue
@@ -133,8 +131,9 @@ class OneAPIHandler(BasePlatformHandler):
             user_data = data['user']
             for field in balance_fields:
                 if field in user_data:
+                    raw = user_data[field]
                     try:
-                        balance_value = float(user_data[field])
+                        balance_value = float(raw)
                         return self._validate_balance(balance_value, f"user.{field}")
                     except (ValueError, TypeError):
                         continue
@@ -150,14 +149,16 @@ class OneAPIHandler(BasePlatformHandler):
 
         for field in currency_fields:
             if field in data:
-                return str(data[field]).upper()
+                raw = data[field]
+                return self._normalize_currency(raw)
 
         # Try nested fields
         if 'user' in data:
             user_data = data['user']
             for field in currency_fields:
                 if field in user_data:
-                    return str(user_data[field]).upper()
+                    raw = user_data[field]
+                    return self._normalize_currency(raw)
 
         # Default to USD for One-API
         return 'USD'
@@ -170,8 +171,7 @@ class OneAPIHandler(BasePlatformHandler):
             if not statistics_url:
                 return 0.0
 
-            headers = self.config.headers.copy() if self.config.headers else {}
-            headers['Authorization'] = f'Bearer {api_key}'
+            headers = self._prepare_headers({'Authorization': f'Bearer {api_key}'})
 
             # Make request to statistics API
             response = self._make_request(
@@ -191,8 +191,9 @@ class OneAPIHandler(BasePlatformHandler):
 
             for field in spent_fields:
                 if field in data:
+                    raw = data[field]
                     try:
-                        spent_value = float(data[field])
+                        spent_value = float(raw)
                         return self._validate_balance(spent_value, field)
                     except (ValueError, TypeError):
                         continue
@@ -202,8 +203,9 @@ class OneAPIHandler(BasePlatformHandler):
                 stats_data = data['statistics']
                 for field in spent_fields:
                     if field in stats_data:
+                        raw = stats_data[field]
                         try:
-                            spent_value = float(stats_data[field])
+                            spent_value = float(raw)
                             return self._validate_balance(spent_value, f"statistics.{field}")
                         except (ValueError, TypeError):
                             continue
@@ -241,8 +243,7 @@ class OneAPIHandler(BasePlatformHandler):
                     raw_data={'error': 'No usage endpoint configured'}
                 )
 
-            headers = self.config.headers.copy() if self.config.headers else {}
-            headers['Authorization'] = f'Bearer {api_key}'
+            headers = self._prepare_headers({'Authorization': f'Bearer {api_key}'})
 
             # Make request to usage API
             response = self._make_request(
@@ -334,8 +335,9 @@ class OneAPIHandler(BasePlatformHandler):
         """Extract token value from data using multiple possible field names"""
         for field in field_names:
             if field in data:
+                raw = data[field]
                 try:
-                    value = float(data[field])
+                    value = float(raw)
                     return max(0.0, value)  # Ensure non-negative
                 except (ValueError, TypeError):
                     continue
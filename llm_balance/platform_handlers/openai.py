@@ -3,7 +3,7 @@ OpenAI platform handler
 """
 
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from .base import BasePlatformHandler, CostInfo, PlatformTokenInfo, ModelTokenInfo
 from ..config import PlatformConfig
 from ..utils import get_proxy_config
@@ -58,16 +58,13 @@ class OpenAIHandler(BasePlatformHandler):
         if not self.config.api_url:
             raise ValueError("No API URL configured for OpenAI")
         
-        # Prepare authentication
-        headers = self.config.headers.copy() if self.config.headers else {}
-        
         # Get API key from environment variable
         api_key = os.getenv(self.config.env_var or 'OPENAI_ADMIN_KEY')
         
         if not api_key:
             raise ValueError("OpenAI Admin API key required. Set OPENAI_ADMIN_KEY environment variable.")
         
-        headers['Authorization'] = f'Bearer {api_key}'
+        headers = self._prepare_headers({'Authorization': f'Bearer {api_key}'})
         
         # Get proxy configuration
         proxies = get_proxy_config()
@@ -84,16 +81,14 @@ class OpenAIHandler(BasePlatformHandler):
         if not response:
             raise ValueError("No response from OpenAI API")
         
-        # Extract balance and currency from response
-        balance = self._extract_balance(response)
-        currency = self._extract_currency(response)
-        spent = self._extract_spent(response)
+        # Walk the cost bucket once for both the amount and its currency
+        amount, currency = self._extract_amount(response)
         
         return CostInfo(
             platform=self.get_platform_name(),
-            balance=balance or 0.0,
+            balance=amount or 0.0,
             currency=currency or 'USD',
-            spent=spent or 0.0,
+            spent=amount or 0.0,
             spent_currency=currency or 'USD',
             raw_data=response
         )
@@ -102,43 +97,17 @@ class OpenAIHandler(BasePlatformHandler):
         """Get platform display name"""
         return "OpenAI"
     
-    def _extract_balance(self, response: Dict[str, Any]) -> Optional[float]:
-        """Extract balance from OpenAI API response"""
-        # OpenAI API returns costs data, we need to calculate balance from usage
-        # For now, we'll extract the most recent usage and calculate remaining balance
-        data = response.get('data', [])
-        if data:
-            latest_cost = data[0]
-            # Extract total usage from the results
-            results = latest_cost.get('results', [])
-            if results:
-                total_usage = results[0].get('amount', {}).get('value', 0)
-                # For OpenAI, we need to calculate balance differently
-                # This is a simplified approach - in practice, you'd need to track total deposits
-                return float(total_usage)
-        return None
-    
-    def _extract_currency(self, response: Dict[str, Any]) -> Optional[str]:
-        """Extract currency from OpenAI API response"""
-        data = response.get('data', [])
-        if data:
-            latest_cost = data[0]
-            results = latest_cost.get('results', [])
-            if results:
-                currency = results[0].get('amount', {}).get('currency', 'USD')
-                return currency
-        return 'USD'
-    
-    def _extract_spent(self, response: Dict[str, Any]) -> Optional[float]:
-        """Extract spent amount from OpenAI API response"""
+    def _extract_amount(self, response: Dict[str, Any]) -> Tuple[Optional[float], str]:
+        """Extract (amount, currency) of the latest cost bucket from OpenAI API response"""
+        # OpenAI API returns costs data; the latest bucket's amount is reported as both
+        # balance and spent (there is no deposit total to derive a real balance from)
         data = response.get('data', [])
         if data:
-            latest_cost = data[0]
-            results = latest_cost.get('results', [])
+            results = data[0].get('results', [])
             if results:
-                spent = results[0].get('amount', {}).get('value', 0)
-                return float(spent)
-        return None
+                amount = results[0].get('amount', {})
+                return float(amount.get('value', 0)), amount.get('currency', 'USD')
+        return None, 'USD'
     
     def get_model_tokens(self) -> PlatformTokenInfo:
         """Get model-level token information from OpenAI"""
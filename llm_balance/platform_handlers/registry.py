@@ -2,102 +2,90 @@
 Platform registry to centralize platform-to-handler mapping.
 """
 
+from importlib import import_module
 from typing import Dict, Any, List, Optional, Type
 
+# Platform name -> (handler module, class name). Modules are imported on first use,
+# so a command touching one platform doesn't import every handler (and its SDK).
+_HANDLER_SPECS = {
+    'deepseek': ('.deepseek', 'DeepSeekHandler'),
+    'moonshot': ('.moonshot', 'MoonshotHandler'),
+    'volcengine': ('.volcengine', 'VolcengineHandler'),
+    'aliyun': ('.aliyun', 'AliyunHandler'),
+    'tencent': ('.tencent', 'TencentHandler'),
+    'zhipu': ('.zhipu', 'ZhipuHandler'),
+    'siliconflow': ('.siliconflow', 'SiliconFlowHandler'),
+    'openai': ('.openai', 'OpenAIHandler'),
+    'anthropic': ('.anthropic', 'AnthropicHandler'),
+    'google': ('.google', 'GoogleHandler'),
+    'foxcode': ('.foxcode', 'FoxCodeHandler'),
+    'duckcoding': ('.duckcoding', 'DuckCodingHandler'),
+    'packycode': ('.packycode', 'PackyCodeHandler'),
+    '88code': ('._88code', 'Handler88Code'),
+    '88996': ('._88996', 'Handler88996'),
+    'yourapi': ('.yourapi', 'YourAPIHandler'),
+    'csmindai': ('.csmindai', 'CSMindAIHandler'),
+    'yesvg': ('.yesvg', 'YesVgHandler'),
+    'oneapi': ('.oneapi', 'OneAPIHandler'),
+    'apiproxy': ('.apiproxy', 'APIProxyHandler'),
+    'fastgpt': ('.fastgpt', 'FastGPTHandler'),
+    'minimax': ('.minimax', 'MiniMaxHandler'),
+    'cubence': ('.cubence', 'CubenceHandler'),
+    'aicoding': ('.aicoding', 'AICodingHandler'),
+    'dawclaudecode': ('.dawclaudecode', 'DawClaudeCodeHandler'),
+    'magic666': ('.magic666', 'Magic666Handler'),
+    'jimiai': ('.jimiai', 'JimiaiHandler'),
+    'openclaudecode': ('.openclaudecode', 'OpenClaudeCodeHandler'),
+    'ikuncode': ('.ikuncode', 'IKunCodeHandler'),
+    'yescode': ('.yescode', 'YesCodeHandler'),
+    'chatgpt': ('.codex', 'CodexHandler'),
+    'codex': ('.codex', 'CodexHandler'),
+}
+
+class PlatformInfoProxy:
+    """Platform metadata taken from a handler's default config (see PlatformRegistry.get_platform)"""
+
+    def __init__(self, name, config):
+        self.name = name
+        self.display_name = config.get('display_name', name.title())
+        self.description = config.get('description', f"{self.display_name} platform")
+        self.auth_type = config.get('auth_type', 'api_key')
+        self.env_var = config.get('env_var')
+        self.setup_steps = config.get('setup_steps', [])
+        self.notes = config.get('notes', [])
+        self.official_url = config.get('official_url', '')
+        self.api_management_url = config.get('api_management_url', '')
+
 class PlatformRegistry:
     """Registry for LLM platform handlers"""
     
     def __init__(self):
+        # Handler classes resolved so far, by platform name
         self._handlers = {}
-        self._initialized = False
-
-    def _ensure_initialized(self):
-        """Lazy initialization to avoid circular imports"""
-        if self._initialized:
-            return
-            
-        from .deepseek import DeepSeekHandler
-        from .moonshot import MoonshotHandler
-        from .volcengine import VolcengineHandler
-        from .aliyun import AliyunHandler
-        from .tencent import TencentHandler
-        from .zhipu import ZhipuHandler
-        from .siliconflow import SiliconFlowHandler
-        from .openai import OpenAIHandler
-        from .anthropic import AnthropicHandler
-        from .google import GoogleHandler
-        from .foxcode import FoxCodeHandler
-        from .duckcoding import DuckCodingHandler
-        from .packycode import PackyCodeHandler
-        from ._88code import Handler88Code
-        from ._88996 import Handler88996
-        from .yourapi import YourAPIHandler
-        from .csmindai import CSMindAIHandler
-        from .yesvg import YesVgHandler
-        from .oneapi import OneAPIHandler
-        from .apiproxy import APIProxyHandler
-        from .fastgpt import FastGPTHandler
-        from .minimax import MiniMaxHandler
-        from .cubence import CubenceHandler
-        from .aicoding import AICodingHandler
-        from .dawclaudecode import DawClaudeCodeHandler
-        from .magic666 import Magic666Handler
-        from .jimiai import JimiaiHandler
-        from .openclaudecode import OpenClaudeCodeHandler
-        from .ikuncode import IKunCodeHandler
-        from .yescode import YesCodeHandler
-        from .codex import CodexHandler
 
-        self._handlers = {
-            'deepseek': DeepSeekHandler,
-            'moonshot': MoonshotHandler,
-            'volcengine': VolcengineHandler,
-            'aliyun': AliyunHandler,
-            'tencent': TencentHandler,
-            'zhipu': ZhipuHandler,
-            'siliconflow': SiliconFlowHandler,
-            'openai': OpenAIHandler,
-            'anthropic': AnthropicHandler,
-            'google': GoogleHandler,
-            'foxcode': FoxCodeHandler,
-            'duckcoding': DuckCodingHandler,
-            'packycode': PackyCodeHandler,
-            '88code': Handler88Code,
-            '88996': Handler88996,
-            'yourapi': YourAPIHandler,
-            'csmindai': CSMindAIHandler,
-            'yesvg': YesVgHandler,
-            'oneapi': OneAPIHandler,
-            'apiproxy': APIProxyHandler,
-            'fastgpt': FastGPTHandler,
-            'minimax': MiniMaxHandler,
-            'cubence': CubenceHandler,
-            'aicoding': AICodingHandler,
-            'dawclaudecode': DawClaudeCodeHandler,
-            'magic666': Magic666Handler,
-            'jimiai': JimiaiHandler,
-            'openclaudecode': OpenClaudeCodeHandler,
-            'ikuncode': IKunCodeHandler,
-            'yescode': YesCodeHandler,
-            'chatgpt': CodexHandler,
-            'codex': CodexHandler,
-        }
-        self._initialized = True
+    def _load_handler(self, platform_name: str) -> Optional[Type]:
+        """Import a platform's handler module on first use and return its class"""
+        handler_class = self._handlers.get(platform_name)
+        if handler_class is None:
+            spec = _HANDLER_SPECS.get(platform_name)
+            if spec is None:
+                return None
+            module_name, class_name = spec
+            handler_class = getattr(import_module(module_name, __package__), class_name)
+            self._handlers[platform_name] = handler_class
+        return handler_class
 
     def get_handler_class(self, platform_name: str) -> Optional[Type]:
         """Get handler class for a platform"""
-        self._ensure_initialized()
-        return self._handlers.get(platform_name.lower())
+        return self._load_handler(platform_name.lower())
 
     def list_platforms(self) -> List[str]:
         """List all available platform names"""
-        self._ensure_initialized()
-        return sorted(list(self._handlers.keys()))
+        return sorted(_HANDLER_SPECS)
 
     def get_all_handlers(self) -> Dict[str, Type]:
         """Get all registered handlers"""
-        self._ensure_initialized()
-        return self._handlers.copy()
+        return {name: self._load_handler(name) for name in _HANDLER_SPECS}
 
     def get_platform(self, platform_name: str):
         """
@@ -112,18 +100,6 @@ class PlatformRegistry:
         config = handler_cls.get_default_config()
         
         # Create a simple data object for compatibility
-        class PlatformInfoProxy:
-            def __init__(self, name, config):
-                self.name = name
-                self.display_name = config.get('display_name', name.title())
-                self.description = config.get('description', f"{self.display_name} platform")
-                self.auth_type = config.get('auth_type', 'api_key')
-                self.env_var = config.get('env_var')
-                self.setup_steps = config.get('setup_steps', [])
-                self.notes = config.get('notes', [])
-                self.official_url = config.get('official_url', '')
-                self.api_management_url = config.get('api_management_url', '')
-                
         return PlatformInfoProxy(platform_name, config)
 
 # Global registry instance
@@ -50,16 +50,13 @@ class SiliconFlowHandler(BasePlatformHandler):
         if not self.config.api_url:
             raise ValueError("No API URL configured for SiliconFlow")
         
-        # Prepare authentication
-        headers = self.config.headers.copy() if self.config.headers else {}
-        
         # Get API key from environment variable
         api_key = os.getenv(self.config.env_var or 'SILICONFLOW_API_KEY')
         
         if not api_key:
             raise ValueError("SiliconFlow API key required. Set SILICONFLOW_API_KEY environment variable.")
         
-        headers['Authorization'] = f'Bearer {api_key}'
+        headers = self._prepare_headers({'Authorization': f'Bearer {api_key}'})
         
         # Make API request
         response = self._make_request(
@@ -150,14 +147,13 @@ class SiliconFlowHandler(BasePlatformHandler):
                 return 0.0
             
             # Prepare authentication headers - same as user info API
-            headers = self.config.headers.copy() if self.config.headers else {}
-            headers['Authorization'] = f'Bearer {api_key}'
+            headers = self._prepare_headers({'Authorization': f'Bearer {api_key}'})
             
             # Try the billing API endpoint
             billing_api_url = "https://cloud.siliconflow.cn/biz-server/api/v1/invoices/month_cost?year=2025"
             
-            import requests
-            response = requests.get(billing_api_url, headers=headers, timeout=10)
+            # Same keep-alive session as the other SiliconFlow requests
+            response = self._get_session().get(billing_api_url, headers=headers, timeout=10)
             
             # Check if response is JSON
             content_type = response.headers.get('content-type', '').lower()
@@ -2,14 +2,33 @@
 Tencent Cloud platform handler
 """
 
+import json
+import os
+import threading
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from .base import BasePlatformHandler, CostInfo, PlatformTokenInfo, ModelTokenInfo
 from ..config import PlatformConfig
 
+def _response_to_dict(resp) -> Dict[str, Any]:
+    """Convert an SDK response model to a plain dict
+    
+    Uses the model's own _serialize (what to_json_string dumps) to skip the
+    JSON string round trip; older SDKs without it go through the string.
+    """
+    serialize = getattr(resp, '_serialize', None)
+    if serialize is not None:
+        return serialize(allow_none=True)
+    return json.loads(resp.to_json_string())
+
 class TencentHandler(BasePlatformHandler):
     """Tencent Cloud platform cost handler"""
     
+    # SDK clients shared across calls, keyed by credentials and region, so the balance
+    # and bill-summary queries reuse one signer and connection pool
+    _billing_clients: Dict[tuple, Any] = {}
+    _billing_clients_lock = threading.Lock()
+    
     @classmethod
     def get_default_config(cls) -> dict:
         """Get default configuration for Tencent Cloud platform"""
@@ -47,13 +66,28 @@ class TencentHandler(BasePlatformHandler):
         super().__init__(browser)
         self.config = config
     
+    @classmethod
+    def _get_billing_client(cls, secret_id: str, secret_key: str, region: str = "ap-beijing"):
+        """Get the shared BillingClient for a set of credentials, creating it on first use"""
+        from tencentcloud.common import credential
+        from tencentcloud.billing.v20180709 import billing_client
+
+        key = (secret_id, secret_key, region)
+        client = cls._billing_clients.get(key)
+        if client is None:
+            with cls._billing_clients_lock:
+                client = cls._billing_clients.get(key)
+                if client is None:
+                    cred = credential.Credential(secret_id, secret_key)
+                    client = cls._billing_clients[key] = billing_client.BillingClient(cred, region)
+        return client
+    
     def get_balance(self) -> CostInfo:
         """Get cost information from Tencent Cloud"""
         if not self.config.api_url:
             raise ValueError("No API URL configured for Tencent Cloud")
         
         # Get credentials
-        import os
         secret_id = os.getenv('TENCENT_SECRET_ID')
         secret_key = os.getenv('TENCENT_SECRET_KEY')
         
@@ -68,15 +102,12 @@ class TencentHandler(BasePlatformHandler):
         
         # Use SDK if available
         try:
-            from tencentcloud.common import credential
-            from tencentcloud.billing.v20180709 import billing_client, models
+            from tencentcloud.billing.v20180709 import models
             
-            cred = credential.Credential(secret_id, secret_key)
-            client = billing_client.BillingClient(cred, "ap-beijing")
+            client = self._get_billing_client(secret_id, secret_key)
             req = models.DescribeAccountBalanceRequest()
             resp = client.DescribeAccountBalance(req)
-            import json
-            response = json.loads(resp.to_json_string())
+            response = _response_to_dict(resp)
             
         except ImportError:
             # Fallback to HTTP request
@@ -200,17 +231,14 @@ class TencentHandler(BasePlatformHandler):
         """Calculate spent amount for Tencent Cloud using actual billing API"""
         try:
             # Try to get actual spending data from DescribeBillSummary API
-            import os
             secret_id = os.getenv('TENCENT_SECRET_ID')
             secret_key = os.getenv('TENCENT_SECRET_KEY')
             
             if secret_id and secret_key:
                 try:
-                    from tencentcloud.common import credential
-                    from tencentcloud.billing.v20180709 import billing_client, models
+                    from tencentcloud.billing.v20180709 import models
                     
-                    cred = credential.Credential(secret_id, secret_key)
-                    client = billing_client.BillingClient(cred, "ap-beijing")
+                    client = self._get_billing_client(secret_id, secret_key)
                     
                     # Get current month's spending
                     req = models.DescribeBillSummaryRequest()
@@ -219,8 +247,7 @@ class TencentHandler(BasePlatformHandler):
                     req.GroupType = "SummaryByProduct"  # Required parameter
                     
                     resp = client.DescribeBillSummary(req)
-                    import json
-                    summary_response = json.loads(resp.to_json_string())
+                    summary_response = _response_to_dict(resp)
                     
                     # Extract actual spending amount
                     summary_data = summary_response.get('SummaryDetail', [])
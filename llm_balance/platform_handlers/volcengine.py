@@ -3,6 +3,8 @@ Volcengine platform handler
 """
 
 import os
+import re
+import threading
 from typing import Dict, Any, Optional, List
 from datetime import datetime, date, timedelta
 from .base import BasePlatformHandler, CostInfo, PlatformTokenInfo, ModelTokenInfo, CodingPlanInfo, CodingPlanQuota
@@ -11,6 +13,11 @@ from ..config import PlatformConfig
 class VolcengineHandler(BasePlatformHandler):
     """Volcengine platform cost handler"""
     
+    # SDK billing clients shared across calls, keyed by credentials and region, so the
+    # balance, spent and package queries reuse one configured client and its connections
+    _billing_apis: Dict[tuple, Any] = {}
+    _billing_apis_lock = threading.Lock()
+    
     @classmethod
     def get_default_config(cls) -> dict:
         """Get default configuration for Volcengine platform"""
@@ -62,10 +69,29 @@ class VolcengineHandler(BasePlatformHandler):
         else:
             return self._get_balance_with_cookies()
     
+    @classmethod
+    def _get_billing_api(cls, access_key: str, secret_key: str, region: str):
+        """Get the shared billing API client for a set of credentials, creating it on first use"""
+        import volcenginesdkcore
+        import volcenginesdkbilling
+
+        key = (access_key, secret_key, region)
+        api = cls._billing_apis.get(key)
+        if api is None:
+            with cls._billing_apis_lock:
+                api = cls._billing_apis.get(key)
+                if api is None:
+                    configuration = volcenginesdkcore.Configuration()
+                    configuration.ak = access_key
+                    configuration.sk = secret_key
+                    configuration.region = region
+                    volcenginesdkcore.Configuration.set_default(configuration)
+                    api = cls._billing_apis[key] = volcenginesdkbilling.BILLINGApi()
+        return api
+    
     def _get_balance_with_sdk(self) -> CostInfo:
         """Get balance using Volcengine official SDK"""
         try:
-            import os
             from volcenginesdkcore.rest import ApiException
             
             # Get credentials from environment variables
@@ -79,19 +105,11 @@ class VolcengineHandler(BasePlatformHandler):
             
             try:
                 # Import official SDK
-                import volcenginesdkcore
                 import volcenginesdkbilling
                 from volcenginesdkbilling.models import QueryBalanceAcctRequest
                 
-                # Configure SDK
-                configuration = volcenginesdkcore.Configuration()
-                configuration.ak = access_key
-                configuration.sk = secret_key
-                configuration.region = self.config.region or "cn-beijing"
-                volcenginesdkcore.Configuration.set_default(configuration)
-                
                 # Create API instance
-                api_instance = volcenginesdkbilling.BILLINGApi()
+                api_instance = self._get_billing_api(access_key, secret_key, self.config.region or "cn-beijing")
                 
                 # Create balance query request
                 query_balance_request = QueryBalanceAcctRequest()
@@ -258,10 +276,6 @@ class VolcengineHandler(BasePlatformHandler):
         2. Browser cookies (via pycookiecheat)
         """
         try:
-            import requests
-            import re
-            import json as json_module
-            
             cookies = {}
             csrf_token = None
             
@@ -286,10 +300,6 @@ class VolcengineHandler(BasePlatformHandler):
             if not csrf_token:
                 raise ValueError("Failed to get CSRF token for Volcengine. Please re-login in browser.")
             
-            session = requests.Session()
-            for key, value in cookies.items():
-                session.cookies.set(key, value)
-            
             referer_url = "https://console.volcengine.com/ark/region:ark+cn-beijing/openManagement/codingPlan"
             api_headers = {
                 "User-Agent": self.config.headers.get("User-Agent", "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"),
@@ -301,7 +311,8 @@ class VolcengineHandler(BasePlatformHandler):
             }
             
             api_url = "https://console.volcengine.com/api/top/ark/cn-beijing/2024-01-01/GetCodingPlanUsage"
-            api_response = session.post(api_url, headers=api_headers, json={}, timeout=10)
+            # Shared keep-alive session; the login cookies go with this request only
+            api_response = self._get_session().post(api_url, headers=api_headers, cookies=cookies, json={}, timeout=10)
             
             if api_response.status_code != 200:
                 raise ValueError(f"API request failed with status {api_response.status_code}")
@@ -351,7 +362,6 @@ class VolcengineHandler(BasePlatformHandler):
     def _get_model_tokens_with_sdk(self) -> PlatformTokenInfo:
         """Get model-level tokens using official Volcengine SDK with ListResourcePackages API"""
         try:
-            import os
             from volcenginesdkcore.rest import ApiException
             
             # Get credentials from environment variables
@@ -365,19 +375,11 @@ class VolcengineHandler(BasePlatformHandler):
             
             try:
                 # Import official SDK
-                import volcenginesdkcore
                 import volcenginesdkbilling
                 from volcenginesdkbilling.models import ListResourcePackagesRequest
                 
-                # Configure SDK
-                configuration = volcenginesdkcore.Configuration()
-                configuration.ak = access_key
-                configuration.sk = secret_key
-                configuration.region = self.config.region or "cn-beijing"
-                volcenginesdkcore.Configuration.set_default(configuration)
-                
                 # Use ListResourcePackages API for actual model-level token data
-                api_instance = volcenginesdkbilling.BILLINGApi()
+                api_instance = self._get_billing_api(access_key, secret_key, self.config.region or "cn-beijing")
                 list_resource_packages_request = volcenginesdkbilling.ListResourcePackagesRequest(
                     max_results="20",
                     resource_type="Package",
@@ -550,7 +552,6 @@ class VolcengineHandler(BasePlatformHandler):
                     continue
                 
                 # Extract package/model name from ConfigurationName using regex
-                import re
                 package_name = config_name or "Unknown Model"
                 model_name = config_name or "Unknown Model"
                 if config_name:
@@ -590,7 +591,6 @@ class VolcengineHandler(BasePlatformHandler):
     def _get_spent_from_billing_api(self) -> float:
         """Get spent amount from Volcengine billing API using ListBillOverviewByCategory"""
         try:
-            import os
             from volcenginesdkcore.rest import ApiException
             
             # Get credentials from environment variables
@@ -602,18 +602,10 @@ class VolcengineHandler(BasePlatformHandler):
             
             try:
                 # Import official SDK
-                import volcenginesdkcore
                 import volcenginesdkbilling
                 
-                # Configure SDK
-                configuration = volcenginesdkcore.Configuration()
-                configuration.ak = access_key
-                configuration.sk = secret_key
-                configuration.region = self.config.region or "cn-beijing"
-                volcenginesdkcore.Configuration.set_default(configuration)
-                
                 # Use billing API to get actual consumption data
-                api_instance = volcenginesdkbilling.BILLINGApi()
+                api_instance = self._get_billing_api(access_key, secret_key, self.config.region or "cn-beijing")
                 
                 total_spent = 0.0
                 
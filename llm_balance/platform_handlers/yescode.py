@@ -103,8 +103,7 @@ class YesCodeHandler(BasePlatformHandler):
         if not api_key:
             raise ValueError("YesCode API key required. Set YESCODE_API_KEY or YESCODE_API_TOKEN environment variable.")
         
-        headers = self.config.headers.copy() if self.config.headers else {}
-        headers['Authorization'] = f'Bearer {api_key}'
+        headers = self._prepare_headers({'Authorization': f'Bearer {api_key}'})
         
         api_url = f"{self.config.api_url}?timezone=Asia/Shanghai"
         
@@ -2,13 +2,109 @@
 Zhipu AI (智谱AI) platform handler
 """
 
-from typing import Dict, Any, Optional, List
+import os
+import re
+import threading
+import time
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 from .base import BasePlatformHandler, CostInfo, PlatformTokenInfo, ModelTokenInfo, CodingPlanInfo, CodingPlanQuota
 from ..config import PlatformConfig
 
+# Chinese numerals: digits, in-section units and section units
+_CHINESE_DIGITS = {
+    '零': 0, '一': 1, '二': 2, '两': 2, '三': 3, '四': 4,
+    '五': 5, '六': 6, '七': 7, '八': 8, '九': 9,
+}
+_CHINESE_SMALL_UNITS = {'十': 10, '百': 100, '千': 1000}
+_CHINESE_WAN = 10000
+_CHINESE_YI = 100000000
+
+# Cookie names that may carry the Zhipu auth token, in priority order
+_AUTH_COOKIE_NAMES = ('bigmodel_token_production', 'token', 'session_token', 'auth_token')
+
+# Token package row fields read by _extract_model_tokens
+_TOKEN_ROW_FIELDS = frozenset({
+    'status', 'resourcePackageName', 'name', 'suitableModel',
+    'availableBalance', 'remaining', 'tokenBalance', 'total',
+})
+
+# Sort key for token packages (C-level getter instead of a lambda)
+_REMAINING_TOKENS_KEY = attrgetter('remaining_tokens')
+
+# Unit character -> (multiplier, unit) for numbers like 100次, 1亿, 200万
+_UNIT_TABLE = {
+    '次': (1, '次'),
+    '亿': (100000000, 'tokens'),
+    '万': (10000, 'tokens'),
+    '千': (1000, 'tokens'),
+    '百': (100, 'tokens'),
+}
+
+# Package name patterns, compiled once instead of per package
+_NUMBER_UNIT_RE = re.compile(r'(\d+)\s*([次亿万千百]?)')
+_CHINESE_RE = re.compile(r'([零一二两三四五六七八九十百千万亿]+)')
+
+_STATUS_EFFECTIVE = 'EFFECTIVE'
+
+# Seconds the aggregated fetch is reused; handlers are shared process-wide, so results must expire
+_RESPONSES_TTL = 60
+
+# Endpoint groups of the aggregated fetch: cost needs account + billing, package needs tokens
+_BALANCE_ENDPOINTS = ('account', 'billing')
+_TOKEN_ENDPOINTS = ('tokens',)
+
+_TOKEN_ACCOUNTS_URL = "https://bigmodel.cn/api/biz/tokenAccounts/list"
+_TOKEN_ACCOUNTS_PARAMS = {
+    'pageNum': 1,
+    'pageSize': 50,  # Increase page size to get all packages
+    'filterEnabled': 'false'
+}
+
+def _parse_chinese_number(text: str) -> int:
+    """Evaluate a Chinese numeral such as '二百', '十万' or '一亿五千万'"""
+    total = 0    # value of completed 万/亿 sections
+    section = 0  # value below 万 accumulated so far
+    digit = 0    # pending digit waiting for its unit
+    for char in text:
+        if char in _CHINESE_DIGITS:
+            digit = _CHINESE_DIGITS[char]
+        elif char in _CHINESE_SMALL_UNITS:
+            # A bare unit like 十 or 千 means one of it
+            section += (digit or 1) * _CHINESE_SMALL_UNITS[char]
+            digit = 0
+        elif char == '万':
+            total += ((section + digit) or 1) * _CHINESE_WAN
+            section = digit = 0
+        elif char == '亿':
+            total = ((total + section + digit) or 1) * _CHINESE_YI
+            section = digit = 0
+    return total + section + digit
+
+def _first_float(row: Dict[str, Any], *keys: str, default: float = 0.0) -> float:
+    """Return the first present (non-None) value among keys as float, looking each key up once"""
+    for key in keys:
+        value = row.get(key)
+        if value is not None:
+            return float(value)
+    return default
+
 class ZhipuHandler(BasePlatformHandler):
     """Zhipu AI (智谱AI) platform cost handler"""
     
+    # Token API fields kept in package raw_data output
+    raw_data_projection = {
+        'code': None,
+        'msg': None,
+        'data': {
+            'basicCustomerInfo': {'balance', 'currency'},
+            'rows': _TOKEN_ROW_FIELDS,
+            'total': None,
+        },
+        'rows': _TOKEN_ROW_FIELDS,
+    }
+    
     @classmethod
     def get_default_config(cls) -> dict:
         """Get default configuration for Zhipu AI platform"""
@@ -45,6 +141,14 @@ class ZhipuHandler(BasePlatformHandler):
     def __init__(self, config, browser: str = 'chrome'):
         super().__init__(browser)
         self.config = config
+        # Responses of the last fully successful aggregated fetch, with the time it was made
+        self._responses = {}
+        self._responses_at = 0.0
+        self._fetch_lock = threading.Lock()
+        # Resolved (headers, cookies) shared by all requests, re-read after _RESPONSES_TTL
+        # or an authentication failure so a rotated login cookie is picked up
+        self._auth_cache = None
+        self._auth_cache_at = 0.0
     
     def get_balance(self) -> CostInfo:
         """Get cost information from Zhipu AI"""
@@ -52,37 +156,8 @@ class ZhipuHandler(BasePlatformHandler):
         if not api_url:
             raise ValueError("No API URL configured for Zhipu AI")
         
-        # Prepare authentication
-        headers = self.config.headers.copy()
-        
-        # Get cookies
-        cookies = {}
-        if self.config.cookie_domain:
-            cookies = self._get_cookies(self.config.cookie_domain)
-        
-        # Check if we have necessary cookies for authentication
-        if not cookies:
-            raise ValueError(f"No authentication cookies found for {self.config.cookie_domain}. Please ensure you are logged in to Zhipu AI in {self.browser} browser.")
-        
-        # Try different possible cookie names for authentication
-        auth_cookie = None
-        for cookie_name in ['bigmodel_token_production', 'token', 'session_token', 'auth_token']:
-            if cookie_name in cookies:
-                auth_cookie = cookies[cookie_name]
-                break
-        if not auth_cookie:
-            raise ValueError(f"No authentication token found in cookies for {self.config.cookie_domain}. Please ensure you are logged in to Zhipu AI.")
-        
-        headers['authorization'] = auth_cookie
-        
-        # Make API request
-        response = self._make_request(
-            url=self.config.api_url,
-            method=self.config.method,
-            headers=headers,
-            params=self.config.params,
-            data=self.config.data
-        )
+        responses = self._fetch_responses(_BALANCE_ENDPOINTS)
+        response = responses['account']
 
         if not response:
             raise ValueError("No response from Zhipu AI API")
@@ -92,8 +167,8 @@ class ZhipuHandler(BasePlatformHandler):
         balance = self._extract_balance(response)
         currency = self._extract_currency(response)
         
-        # Calculate spent amount from API response
-        spent = self._calculate_spent_amount(response)
+        # Spent amount was fetched concurrently from the billing API
+        spent = responses['billing']
         
         return CostInfo(
             platform=self.get_platform_name(),
@@ -113,11 +188,38 @@ class ZhipuHandler(BasePlatformHandler):
         if not self.config.api_url:
             raise ValueError("No API URL configured for Zhipu AI")
         
-        # Token API endpoint
-        token_api_url = "https://bigmodel.cn/api/biz/tokenAccounts/list"
+        response = self._fetch_responses(_TOKEN_ENDPOINTS)['tokens']
         
-        # Prepare authentication
-        headers = self.config.headers.copy()
+        if not response:
+            raise ValueError("No response from Zhipu AI token API")
+        
+        # Parse token data from response
+        models = self._extract_model_tokens(response)
+        
+        return PlatformTokenInfo(
+            platform=self.get_platform_name(),
+            models=models,
+            raw_data=response
+        )
+
+    def fetch_all(self) -> Tuple[CostInfo, PlatformTokenInfo]:
+        """Fetch balance, spent and token packages in one aggregated call
+        
+        The account, billing and token endpoints are requested concurrently,
+        so the total latency is that of the slowest request; get_balance and
+        get_model_tokens are then served from that fetch.
+        """
+        self._fetch_responses(_BALANCE_ENDPOINTS + _TOKEN_ENDPOINTS)
+        return self.get_balance(), self.get_model_tokens()
+
+    def _auth_headers(self) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Resolve request headers with the auth cookie (memoized for _RESPONSES_TTL)
+        
+        Returns (headers, cookies). The returned dicts are shared between
+        calls and must not be mutated.
+        """
+        if self._auth_cache is not None and time.monotonic() - self._auth_cache_at < _RESPONSES_TTL:
+            return self._auth_cache
         
         # Get cookies
         cookies = {}
@@ -129,55 +231,78 @@ class ZhipuHandler(BasePlatformHandler):
             raise ValueError(f"No authentication cookies found for {self.config.cookie_domain}. Please ensure you are logged in to Zhipu AI in {self.browser} browser.")
         
         # Try different possible cookie names for authentication
-        auth_cookie = None
-        for cookie_name in ['bigmodel_token_production', 'token', 'session_token', 'auth_token']:
-            if cookie_name in cookies:
-                auth_cookie = cookies[cookie_name]
-                break
+        auth_cookie = next((cookies[name] for name in _AUTH_COOKIE_NAMES if name in cookies), None)
         if not auth_cookie:
             raise ValueError(f"No authentication token found in cookies for {self.config.cookie_domain}. Please ensure you are logged in to Zhipu AI.")
         
+        headers = self.config.headers.copy()
         headers['authorization'] = auth_cookie
-        
-        # Make API request to token endpoint
-        params = {
-            'pageNum': 1,
-            'pageSize': 50,  # Increase page size to get all packages
-            'filterEnabled': 'false'
-        }
-        
-        response = self._make_request(
-            url=token_api_url,
+        self._auth_cache = (headers, cookies)
+        self._auth_cache_at = time.monotonic()
+        return self._auth_cache
+
+    def _fetch_responses(self, names: Tuple[str, ...]) -> Dict[str, Any]:
+        """Request the named endpoints concurrently, reusing a fetch younger than _RESPONSES_TTL
+        
+        Results are kept only when every request succeeded; otherwise the first
+        error is raised and nothing is cached, so the next call retries.
+        """
+        with self._fetch_lock:
+            if (time.monotonic() - self._responses_at < _RESPONSES_TTL
+                    and all(name in self._responses for name in names)):
+                return self._responses
+            
+            # Whatever happens below, the previous fetch is no longer served
+            self._responses = {}
+            headers, _ = self._auth_headers()
+            
+            try:
+                if len(names) == 1:
+                    responses = {names[0]: self._request_endpoint(names[0], headers)}
+                else:
+                    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+                        futures = {name: executor.submit(self._request_endpoint, name, headers) for name in names}
+                    # Raises the first failure; the pool has already waited for the other requests
+                    responses = {name: future.result() for name, future in futures.items()}
+            except ValueError as e:
+                if str(e).startswith('Authentication failed'):
+                    # Expired or rotated cookie: read it from the browser again next time
+                    self._auth_cache = None
+                raise
+            
+            self._responses = responses
+            self._responses_at = time.monotonic()
+            return responses
+
+    def _request_endpoint(self, name: str, headers: Dict[str, Any]) -> Any:
+        """Make one request of the aggregated fetch"""
+        if name == 'account':
+            return self._make_request(
+                url=self.config.api_url,
+                method=self.config.method,
+                headers=headers,
+                params=self.config.params,
+                data=self.config.data
+            )
+        if name == 'billing':
+            # The billing API does not depend on the account response
+            return self._calculate_spent_amount(headers=headers)
+        return self._make_request(
+            url=_TOKEN_ACCOUNTS_URL,
             method='GET',
             headers=headers,
-            params=params
-        )
-        
-        if not response:
-            raise ValueError("No response from Zhipu AI token API")
-        
-        # Parse token data from response
-        models = self._extract_model_tokens(response)
-        
-        return PlatformTokenInfo(
-            platform=self.get_platform_name(),
-            models=models,
-            raw_data=response
+            params=_TOKEN_ACCOUNTS_PARAMS
         )
 
     def get_coding_plan(self) -> CodingPlanInfo:
         """Get coding plan information from Zhipu AI"""
-        import os
         from datetime import datetime
         
         auth_token = os.getenv('ZHIPU_AUTH_TOKEN') or os.getenv('ANTHROPIC_AUTH_TOKEN')
         
         if not auth_token:
             cookies = self._get_cookies(self.config.cookie_domain)
-            for cookie_name in ['bigmodel_token_production', 'token', 'session_token', 'auth_token']:
-                if cookie_name in cookies:
-                    auth_token = cookies[cookie_name]
-                    break
+            auth_token = next((cookies[name] for name in _AUTH_COOKIE_NAMES if name in cookies), None)
         
         if not auth_token:
             raise NotImplementedError("Zhipu auth token required for coding plan. Set ZHIPU_AUTH_TOKEN environment variable.")
@@ -249,7 +374,7 @@ class ZhipuHandler(BasePlatformHandler):
         
         for row in rows:
             # Only process effective packages
-            if row.get('status') != 'EFFECTIVE':
+            if row.get('status') != _STATUS_EFFECTIVE:
                 continue
             
             # Extract package information - always use resourcePackageName for display
@@ -259,7 +384,7 @@ class ZhipuHandler(BasePlatformHandler):
             model_name = row.get('suitableModel', package_name)
             
             # Get available balance - handle both availableBalance and remaining tokens
-            available_balance = float(row.get('availableBalance', row.get('remaining', 0)))
+            available_balance = _first_float(row, 'availableBalance', 'remaining')
             
             # Always extract total from package name since API returns remaining as "total"
             extracted_total, unit = self._extract_tokens_from_package_name(package_name)
@@ -274,7 +399,7 @@ class ZhipuHandler(BasePlatformHandler):
                     used_tokens = max(0, token_balance - available_balance)
             else:
                 # Fallback to API values if extraction fails
-                token_balance = float(row.get('tokenBalance', row.get('total', available_balance)))
+                token_balance = _first_float(row, 'tokenBalance', 'total', default=available_balance)
                 used_tokens = max(0, token_balance - available_balance)
             
             # Create model token info with package name as primary identifier
@@ -289,92 +414,32 @@ class ZhipuHandler(BasePlatformHandler):
             models.append(model_info)
         
         # Sort models by remaining tokens (descending) for better display
-        models.sort(key=lambda x: x.remaining_tokens, reverse=True)
+        models.sort(key=_REMAINING_TOKENS_KEY, reverse=True)
         
         return models
     
     def _extract_tokens_from_package_name(self, package_name: str) -> tuple[float, str]:
         """Extract token count and unit from Chinese package names like '1亿GLM-4.5资源包' or '100次视频资源包'"""
-        import re
-        
-        # Chinese number mappings
-        chinese_numbers = {
-            '一': 1, '二': 2, '三': 3, '四': 4, '五': 5, '六': 6, '七': 7, '八': 8, '九': 9, '十': 10,
-            '百': 100, '千': 1000, '万': 10000, '亿': 100000000
-        }
-        
-        # First check for 次 (times) unit
-        times_patterns = [
-            r'(\d+)次',           # 100次, 50次
-            r'(\d+)次',           # 100次 (with Chinese)
-        ]
-        
-        for pattern in times_patterns:
-            match = re.search(pattern, package_name)
-            if match:
-                number_str = match.group(1)
-                try:
-                    return float(number_str), '次'
-                except ValueError:
-                    continue
-        
-        # Patterns for token counts: 1亿, 1000万, 200万, etc.
-        token_patterns = [
-            r'(\d+)亿',           # 1亿, 100亿
-            r'(\d+)万',           # 1000万, 200万
-            r'(\d+)千',           # 1000千
-            r'(\d+)百',           # 200百
-            r'(\d+)',             # plain numbers like 200
-        ]
-        
-        for pattern in token_patterns:
-            match = re.search(pattern, package_name)
-            if match:
-                number_str = match.group(1)
-                try:
-                    base_number = float(number_str)
-                    
-                    # Check for unit suffixes
-                    if '亿' in package_name:
-                        return base_number * 100000000, 'tokens'
-                    elif '万' in package_name:
-                        return base_number * 10000, 'tokens'
-                    elif '千' in package_name:
-                        return base_number * 1000, 'tokens'
-                    elif '百' in package_name:
-                        return base_number * 100, 'tokens'
-                    else:
-                        return base_number, 'tokens'
-                except ValueError:
-                    continue
+        # Single pass: the first number followed by a unit wins, otherwise
+        # fall back to the first plain number like 200
+        plain_number = None
+        for match in _NUMBER_UNIT_RE.finditer(package_name):
+            unit_char = match.group(2)
+            if unit_char:
+                multiplier, unit = _UNIT_TABLE[unit_char]
+                return float(match.group(1)) * multiplier, unit
+            if plain_number is None:
+                plain_number = float(match.group(1))
+        
+        if plain_number is not None:
+            return plain_number, 'tokens'
         
         # Handle Chinese character numbers like "二百" or "一千"
-        chinese_pattern = r'([一二三四五六七八九十百千万亿]+)'
-        match = re.search(chinese_pattern, package_name)
+        match = _CHINESE_RE.search(package_name)
         if match:
-            chinese_str = match.group(1)
-            try:
-                # Simple conversion for common patterns
-                if '亿' in chinese_str:
-                    return 100000000, 'tokens'
-                elif '万' in chinese_str:
-                    # Extract the number before 万
-                    num_match = re.search(r'(\d+|[一二三四五六七八九十])万', chinese_str)
-                    if num_match:
-                        num_str = num_match.group(1)
-                        if num_str.isdigit():
-                            return float(num_str) * 10000, 'tokens'
-                        else:
-                            return chinese_numbers.get(num_str, 1) * 10000, 'tokens'
-                    return 10000, 'tokens'  # Default 1万
-                elif '千' in chinese_str:
-                    return 1000, 'tokens'
-                elif '百' in chinese_str:
-                    return 100, 'tokens'
-                else:
-                    return 2000000, 'tokens'  # Default 200万 for common packages
-            except:
-                pass
+            value = _parse_chinese_number(match.group(1))
+            if value > 0:
+                return float(value), 'tokens'
         
         return 0, 'tokens'
     
@@ -389,8 +454,11 @@ class ZhipuHandler(BasePlatformHandler):
                 return None
         return None
     
-    def _calculate_spent_amount(self, response: Dict[str, Any]) -> float:
-        """Calculate spent amount from Zhipu billing API"""
+    def _calculate_spent_amount(self, headers: Optional[Dict[str, Any]] = None) -> float:
+        """Calculate spent amount from Zhipu billing API
+        
+        Pass already resolved auth headers to skip resolving them again.
+        """
         try:
             # Use the billing API to get spent amount
             billing_api_url = "https://www.bigmodel.cn/api/finance/monthlyBill/aggregatedMonthlyBills"
@@ -416,19 +484,8 @@ class ZhipuHandler(BasePlatformHandler):
             }
             
             # Prepare authentication
-            headers = self.config.headers.copy()
-            cookies = {}
-            if self.config.cookie_domain:
-                cookies = self._get_cookies(self.config.cookie_domain)
-            
-            if cookies:
-                auth_cookie = None
-                for cookie_name in ['bigmodel_token_production', 'token', 'session_token', 'auth_token']:
-                    if cookie_name in cookies:
-                        auth_cookie = cookies[cookie_name]
-                        break
-                if auth_cookie:
-                    headers['authorization'] = auth_cookie
+            if headers is None:
+                headers, _ = self._auth_headers()
             
             # Make billing API request
             billing_response = self._make_request(
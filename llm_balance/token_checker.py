@@ -2,63 +2,105 @@
 Main token checker functionality
 """
 
+import bisect
 import json
-import threading
+import os
+import re
+import sys
+import time
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from .config import ConfigManager
 from .platform_configs import PlatformConfig
-from .platform_handlers.base import BasePlatformHandler, PlatformTokenInfo
+from .platform_handlers.base import BasePlatformHandler, PlatformTokenInfo, ModelTokenInfo
 from .token_formatter import format_model_tokens
-from .platform_handlers import create_handler
+from .platform_handlers import get_handler
+from .utils import cache_fingerprint, is_error_result, json_default, MAX_WORKERS, map_concurrently, print_line
+
+# Errors a platform check is expected to hit: network failures (requests'
+# RequestException is an OSError), bad credentials/responses and missing fields
+_EXPECTED_ERRORS = (OSError, ValueError, KeyError, NotImplementedError)
+
+# Error messages that mean the platform rejected our credentials
+_AUTH_FAILURE_PATTERN = re.compile(r'401|Authentication')
+
+def _project_raw(value, projection):
+    """Copy only the whitelisted subtree of raw data
+    
+    A projection is None (keep the whole value), a set of keys to keep as-is,
+    or a dict mapping keys to nested projections. Lists apply the projection
+    to each of their items.
+    """
+    if projection is None:
+        return value
+    if isinstance(value, list):
+        return [_project_raw(item, projection) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if isinstance(projection, (set, frozenset)):
+        return {k: v for k, v in value.items() if k in projection}
+    return {k: _project_raw(value[k], sub) for k, sub in projection.items() if k in value}
+
+def _model_to_dict(model: ModelTokenInfo) -> Dict[str, Any]:
+    """Shallow-copy a ModelTokenInfo's fields into a plain dict (C-level dict copy)"""
+    return model.__dict__.copy()
+
+def _platform_sort_key(token_info: Dict[str, Any]) -> str:
+    return token_info['platform'].lower()
+
+def _model_sort_key(model_info: Dict[str, Any]) -> str:
+    return (model_info.get('model') or '').lower()
 
 class TokenChecker:
     """Main token checker class"""
     
-    def __init__(self, config_file: str = None, browser: str = None):
+    def __init__(self, config_file: str = None, browser: str = None,
+                 use_cache: bool = True, refresh: bool = False):
         self.config_manager = ConfigManager(config_file)
         # Use provided browser or fall back to global configuration
         self.browser = browser or self.config_manager.get_global_browser()
-        self.handlers = {}
-        # Thread pool size for concurrent platform checking
-        self.max_workers = 5
-        # Thread lock for handler cache
-        self._handler_lock = threading.Lock()
+        # On-disk result cache: use_cache=False bypasses it entirely,
+        # refresh=True skips cached reads but still stores fresh results
+        self.use_cache = use_cache
+        self.refresh = refresh
+        self.cache_dir = Path.home() / '.llm_balance' / 'cache' / 'tokens'
+        self.max_workers = MAX_WORKERS
 
-    def _check_single_token(self, platform_config: PlatformConfig) -> Optional[Dict[str, Any]]:
+    def _check_single_token(self, platform_config: PlatformConfig, sort: str = 'none') -> Optional[Dict[str, Any]]:
         """Check token balance for a single platform (thread-safe helper method)"""
         try:
             # Skip platforms with show_package disabled
             if not platform_config.show_package:
                 return None
 
+            platform_data = self._load_cached(platform_config)
+            if platform_data is not None:
+                if sort == 'name':
+                    platform_data['models'].sort(key=_model_sort_key)
+                return platform_data
+
             handler = self._get_handler(platform_config)
             try:
                 token_info = handler.get_model_tokens()
                 # Convert PlatformTokenInfo to dict format for backward compatibility
                 platform_data = {
                     'platform': token_info.platform,
-                    'models': [
-                        {
-                            'model': model.model,
-                            'package': model.package,
-                            'remaining_tokens': model.remaining_tokens,
-                            'used_tokens': model.used_tokens,
-                            'total_tokens': model.total_tokens,
-                            'status': model.status,
-                            'expiry_date': model.expiry_date,
-                            'reset_count': model.reset_count
-                        }
-                        for model in token_info.models
-                    ],
-                    'raw_data': token_info.raw_data
+                    'models': [_model_to_dict(model) for model in token_info.models],
+                    'raw_data': self._select_raw_data(handler, token_info.raw_data)
                 }
+                if not is_error_result(token_info.raw_data):
+                    self._store_cached(platform_config, platform_data)
+                if sort == 'name':
+                    # Sort models here so it overlaps with other platforms' network I/O
+                    platform_data['models'].sort(key=_model_sort_key)
                 return platform_data
             except NotImplementedError:
                 # Platform doesn't support token checking - skip it
                 return None
-        except Exception as e:
-            # Skip platforms that don't support tokens or have errors
+        except _EXPECTED_ERRORS:
+            # Skip platforms that don't support tokens or have errors; anything
+            # else is a bug and propagates to check_all_tokens to be reported
             return None
 
     def check_all_tokens(self, sort: str = 'name') -> List[Dict[str, Any]]:
@@ -69,12 +111,15 @@ class TokenChecker:
             sort: Sort order for results - 'name' (alphabetical), 'none' (as-is)
         """
         tokens = []
+        # Sorted platform-name keys parallel to tokens, used when sort == 'name'
+        sort_keys = []
         platforms = [p for p in self.config_manager.get_enabled_platforms() if p.show_package]
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+        workers = max(1, min(len(platforms), self.max_workers))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
             # Submit all platform checks to thread pool
             future_to_platform = {
-                executor.submit(self._check_single_token, config): config
+                executor.submit(self._check_single_token, config, sort): config
                 for config in platforms
             }
 
@@ -82,26 +127,29 @@ class TokenChecker:
             for future in as_completed(future_to_platform):
                 try:
                     result = future.result()
-                    if result:
+                    if not result:
+                        continue
+                    if sort == 'name':
+                        # Insert alphabetically by platform name for consistent, predictable output
+                        # (models within each platform were already sorted by the workers)
+                        key = _platform_sort_key(result)
+                        index = bisect.bisect(sort_keys, key)
+                        sort_keys.insert(index, key)
+                        tokens.insert(index, result)
+                    else:
+                        # 'none': keep the as-is order (preserve concurrent execution order)
                         tokens.append(result)
                 except Exception as e:
-                    # Silently skip platforms with errors
-                    pass
-
-        # Apply sorting if requested
-        if sort == 'name':
-            # Sort alphabetically by platform name for consistent, predictable output
-            tokens.sort(key=lambda x: x['platform'].lower())
-            # Also sort models within each platform for consistent output
-            for token_info in tokens:
-                if 'models' in token_info and isinstance(token_info['models'], list):
-                    token_info['models'].sort(key=lambda x: x.get('model', '').lower())
-        elif sort == 'none':
-            # Keep the as-is order (preserve concurrent execution order)
-            pass
+                    # Expected platform errors were already swallowed by the worker
+                    platform = future_to_platform[future]
+                    print(f"Error checking {platform.name}: {e}", file=sys.stderr)
 
         return tokens
     
+    def check_platforms_tokens(self, platform_names: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Check several named platforms concurrently, returning results in the given order"""
+        return map_concurrently(self.check_platform_tokens, platform_names, self.max_workers)
+
     def check_platform_tokens(self, platform_name: str) -> Optional[Dict[str, Any]]:
         """Check token balance for a specific platform"""
         platform_config = self.config_manager.get_platform(platform_name)
@@ -116,87 +164,90 @@ class TokenChecker:
 
         try:
             # platform_config is already a PlatformConfig object
+            cached = self._load_cached(platform_config)
+            if cached is not None:
+                return cached
 
             handler = self._get_handler(platform_config)
             try:
                 token_info = handler.get_model_tokens()
                 # Convert PlatformTokenInfo to dict format for backward compatibility
-                # Filter out non-serializable objects from raw_data
-                filtered_raw_data = self._clean_raw_data_for_json(token_info.raw_data)
+                # Non-serializable objects in raw_data are handled when JSON is rendered
+                filtered_raw_data = self._select_raw_data(handler, token_info.raw_data or {})
 
-                return {
+                platform_data = {
                     'platform': token_info.platform,
-                    'models': [
-                        {
-                            'model': model.model,
-                            'package': model.package,
-                            'remaining_tokens': model.remaining_tokens,
-                            'used_tokens': model.used_tokens,
-                            'total_tokens': model.total_tokens,
-                            'status': model.status,
-                            'expiry_date': model.expiry_date,
-                            'reset_count': model.reset_count,
-                            'reset_time': model.reset_time
-                        }
-                        for model in token_info.models
-                    ],
+                    'models': [_model_to_dict(model) for model in token_info.models],
                     'raw_data': filtered_raw_data
                 }
+                # Error placeholders (no models plus raw_data['error']) are shown but never cached
+                if not is_error_result(token_info.raw_data):
+                    self._store_cached(platform_config, platform_data)
+                return platform_data
             except NotImplementedError as e:
                 # Platform doesn't support token checking or needs additional configuration
                 error_msg = str(e)
                 if error_msg:
-                    print(f"\n❌ {platform_name}: {error_msg}")
+                    print_line(f"\n❌ {platform_name}: {error_msg}")
                 return None
             except ValueError as e:
                 # API authentication or request errors
                 error_msg = str(e)
-                if "401" in error_msg or "Authentication" in error_msg:
-                    print(f"\n❌ {platform_name}: Authentication failed - your token may have expired or is invalid")
-                    print(f"   Details: {error_msg}")
+                if _AUTH_FAILURE_PATTERN.search(error_msg):
+                    print_line(f"\n❌ {platform_name}: Authentication failed - your token may have expired or is invalid\n"
+                               f"   Details: {error_msg}")
                 else:
-                    print(f"\n❌ {platform_name}: {error_msg}")
+                    print_line(f"\n❌ {platform_name}: {error_msg}")
                 return None
-        except Exception as e:
+        except Exception:
             # Skip platforms that don't support tokens or have errors
             return None
     
-    def _clean_raw_data_for_json(self, raw_data):
-        """Clean raw data to make it JSON serializable"""
-        if not raw_data:
-            return {}
-        
-        def clean_value(value):
-            """Recursively clean values"""
-            if isinstance(value, dict):
-                return {k: clean_value(v) for k, v in value.items()}
-            elif isinstance(value, list):
-                return [clean_value(item) for item in value]
-            elif hasattr(value, '__dict__'):
-                # Convert object to dict, skipping Configuration objects
-                obj_name = value.__class__.__name__
-                if obj_name == 'Configuration':
-                    return f"<{obj_name} object>"
-                return {k: clean_value(v) for k, v in value.__dict__.items()}
-            else:
-                try:
-                    # Test if the value is JSON serializable
-                    json.dumps(value)
-                    return value
-                except (TypeError, ValueError):
-                    return f"<{value.__class__.__name__} object>"
-        
-        return clean_value(raw_data)
+    def _cache_path(self, platform_config: PlatformConfig) -> Path:
+        """Cache file for a platform, keyed by platform, browser (cookie source) and credentials"""
+        return self.cache_dir / f"{platform_config.name}-{self.browser}-{cache_fingerprint(platform_config)}.json"
+
+    def _load_cached(self, platform_config: PlatformConfig) -> Optional[Dict[str, Any]]:
+        """Return cached token data if it is younger than the platform's cache_ttl"""
+        if not self.use_cache or self.refresh or platform_config.cache_ttl <= 0:
+            return None
+        cache_path = self._cache_path(platform_config)
+        try:
+            if time.time() - cache_path.stat().st_mtime >= platform_config.cache_ttl:
+                return None
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # Missing or unreadable cache entry - fetch from the platform
+            return None
+
+    def _store_cached(self, platform_config: PlatformConfig, platform_data: Dict[str, Any]):
+        """Write token data to the cache; failures only cost the next run a fetch"""
+        if not self.use_cache or platform_config.cache_ttl <= 0:
+            return
+        cache_path = self._cache_path(platform_config)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(platform_data, f, ensure_ascii=False, default=json_default)
+            # Atomic swap so concurrent invocations never read a half-written file
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError):
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def _select_raw_data(self, handler: BasePlatformHandler, raw_data):
+        """Keep only the raw_data fields a handler projects, if it declares a projection"""
+        if raw_data and handler.raw_data_projection is not None:
+            return _project_raw(raw_data, handler.raw_data_projection)
+        return raw_data
     
     def _get_handler(self, config: PlatformConfig) -> BasePlatformHandler:
         """Get handler instance for platform configuration (thread-safe)"""
-        # Use double-checked locking pattern for efficiency
-        if config.name not in self.handlers:
-            with self._handler_lock:
-                # Check again after acquiring lock
-                if config.name not in self.handlers:
-                    self.handlers[config.name] = create_handler(config, self.browser)
-        return self.handlers[config.name]
+        return get_handler(config, self.browser)
     
     def list_platforms(self) -> List[str]:
         """List all available platforms"""
@@ -216,6 +267,7 @@ class TokenChecker:
         show_expiry: bool = False,
         show_reset: bool = False,
         show_reset_time: bool = False,
+        compact: bool = False,
     ) -> str:
         """Format token information in specified format"""
-        return format_model_tokens(tokens, format_type, target_currency, model, show_all, show_expiry, show_reset, show_reset_time)
+        return format_model_tokens(tokens, format_type, target_currency, model, show_all, show_expiry, show_reset, show_reset_time, compact)
@@ -2,28 +2,39 @@
 Token formatting utilities for model-level token statistics
 """
 
+import io
 import json
 from typing import Dict, Any, List, Optional
 
-def _clean_for_json(data):
-    """Clean data to make it JSON serializable"""
-    if isinstance(data, dict):
-        return {k: _clean_for_json(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [_clean_for_json(item) for item in data]
-    elif hasattr(data, '__dict__'):
-        # Convert object to dict, skipping Configuration objects
-        obj_name = data.__class__.__name__
-        if obj_name == 'Configuration':
-            return f"<{obj_name} object>"
-        return {k: _clean_for_json(v) for k, v in data.__dict__.items()}
-    else:
-        try:
-            # Test if the value is JSON serializable
-            json.dumps(data)
-            return data
-        except (TypeError, ValueError):
-            return f"<{data.__class__.__name__} object>"
+from .utils import json_default
+
+try:
+    import orjson
+    # Hand datetimes/dataclasses to the default hook like the stdlib encoder does,
+    # and coerce non-str keys the same way json.dumps does
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+except ImportError:  # orjson is optional
+    orjson = None
+
+def _num_str(v) -> float:
+    """Parse a numeric string such as '1,234.5', falling back to 0.0"""
+    try:
+        return float(str(v).strip().replace(',', ''))
+    except Exception:
+        return 0.0
+
+def _num(v) -> float:
+    """Normalize a token count to float; plain numbers skip the string path"""
+    cls = v.__class__
+    if cls is float:
+        return v
+    if cls is int:
+        return float(v)
+    if isinstance(v, (int, float)):
+        return float(v)
+    if v is None:
+        return 0.0
+    return _num_str(v)
 
 def format_model_tokens(
     platform_tokens: List[Dict[str, Any]],
@@ -34,6 +45,7 @@ def format_model_tokens(
     show_expiry: bool = False,
     show_reset: bool = False,
     show_reset_time: bool = False,
+    compact: bool = False,
 ) -> str:
     """Format model-level token information"""
     if not platform_tokens:
@@ -52,7 +64,7 @@ def format_model_tokens(
         return "No token data available"
 
     if format_type == 'json':
-        return _format_model_json(tokens_to_format)
+        return _format_model_json(tokens_to_format, compact)
     elif format_type == 'markdown':
         return _format_model_markdown(tokens_to_format, show_expiry, show_reset, show_reset_time)
     elif format_type == 'total':
@@ -60,87 +72,56 @@ def format_model_tokens(
     else:  # table format
         return _format_model_table(tokens_to_format, target_currency, show_expiry, show_reset, show_reset_time)
 
-def _format_model_table(platform_tokens: List[Dict[str, Any]], target_currency: str = 'CNY', show_expiry: bool = False, show_reset: bool = False, show_reset_time: bool = False) -> str:
-    """Format model tokens as detailed table"""
-    lines = []
+# Package dict keys to use as its display name, in priority order
+_PACKAGE_NAME_KEYS = ('name', 'title', 'plan_name', 'plan', 'id')
 
-    # Calculate column widths based on what we're showing
-    base_width = 125
-    extra_width = 0
-    if show_expiry:
-        extra_width += 12
-    if show_reset:
-        extra_width += 10
-    if show_reset_time:
-        extra_width += 16
+# Field order of the tuples produced by _normalize_table_rows
+_TABLE_ROW_FIELDS = ('platform', 'model', 'total', 'used', 'remaining', 'progress',
+                     'status', 'expiry', 'reset', 'reset_time', 'package')
 
-    total_width = base_width + extra_width
-
-    lines.append("=" * total_width)
-
-    # Build header dynamically - Expiry, Resets, ResetTime before Package
-    header = f"{'Platform':<15} {'Model':<30} {'Total':<12} {'Used':<12} {'Remaining':<12} {'Progress %':<11} {'Status':<8}"
-    if show_expiry:
-        header += f" {'Expiry':<11}"
-    if show_reset:
-        header += f" {'Resets':<9}"
-    if show_reset_time:
-        header += f" {'ResetTime':<15}"
-    header += f" {'Package':<15}"
-
-    lines.append(header)
-    lines.append("-" * total_width)
-    
-    total_all_tokens = 0
-    total_used_tokens = 0
-    total_remaining_tokens = 0
+def _normalize_table_rows(platform_tokens: List[Dict[str, Any]]) -> List[tuple]:
+    """Normalize models into display-ready tuples ordered as _TABLE_ROW_FIELDS
     
+    All per-model type dispatch (package dicts, numeric strings, progress
+    formatting) happens here, so the table writer only interpolates. A platform
+    without models yields a (platform, None) placeholder row.
+    """
+    rows = []
     for platform_data in platform_tokens:
         platform = platform_data['platform']
         models = platform_data.get('models', [])
-        
+
         if not models:
-            lines.append(f"{platform:<15} {'No data':<30} {'-':<12} {'-':<12} {'-':<12} {'-':<11} {'-':<8} {'-':<15}")
+            rows.append((platform, None))
             continue
-        
+
         for model_info in models:
-            model = str(model_info.get('model', ''))[:30]
+            mi_get = model_info.get
+            # Model and status are truncated by the table's format spec, not sliced here
+            model = mi_get('model', '')
+            if type(model) is not str:
+                model = str(model)
+
+            # Take numbers from model_info, but allow override from package dict for FoxCode-like schemas
+            total = _num(mi_get('total_tokens'))
+            used = _num(mi_get('used_tokens'))
+            remaining = _num(mi_get('remaining_tokens'))
 
             # Normalize package for display; if dict, prefer human-readable name
-            raw_package = model_info.get('package', model)
+            raw_package = mi_get('package', model)
             if isinstance(raw_package, dict):
-                pkg_name = (
-                    raw_package.get('name')
-                    or raw_package.get('title')
-                    or raw_package.get('plan_name')
-                    or raw_package.get('plan')
-                    or raw_package.get('id')
-                    or 'Subscription'
-                )
+                pkg_get = raw_package.get
+                pkg_name = 'Subscription'
+                for key in _PACKAGE_NAME_KEYS:
+                    value = pkg_get(key)
+                    if value:
+                        pkg_name = value
+                        break
                 package = str(pkg_name)
-            else:
-                package = str(raw_package)
 
-            # Take numbers from model_info, but allow override from package dict for FoxCode-like schemas
-            def _num(v) -> float:
-                try:
-                    if v is None:
-                        return 0.0
-                    if isinstance(v, (int, float)):
-                        return float(v)
-                    s = str(v).strip().replace(',', '')
-                    return float(s)
-                except Exception:
-                    return 0.0
-
-            total = _num(model_info.get('total_tokens'))
-            used = _num(model_info.get('used_tokens'))
-            remaining = _num(model_info.get('remaining_tokens'))
-
-            # If package dict has quotaLimit/duration, map: Total=quotaLimit, Remaining=duration, Used=Total-Remaining
-            if isinstance(raw_package, dict):
-                pkg_total = _num(raw_package.get('quotaLimit'))
-                pkg_remaining = _num(raw_package.get('duration'))
+                # If package dict has quotaLimit/duration, map: Total=quotaLimit, Remaining=duration, Used=Total-Remaining
+                pkg_total = _num(pkg_get('quotaLimit'))
+                pkg_remaining = _num(pkg_get('duration'))
                 if pkg_total or pkg_remaining:
                     total = pkg_total or total
                     remaining = pkg_remaining or remaining
@@ -150,6 +131,8 @@ def _format_model_table(platform_tokens: List[Dict[str, Any]], target_currency:
                         remaining = max(0.0, total - used)
                     elif used and remaining and not total:
                         total = used + remaining
+            else:
+                package = str(raw_package)
 
             # Calculate progress percentage or display "-"
             if total > 0:
@@ -168,90 +151,167 @@ def _format_model_table(platform_tokens: List[Dict[str, Any]], target_currency:
                 progress_display = " - "
 
             # Get status with default fallback
-            status = str(model_info.get('status', 'active'))[:8]
+            status = mi_get('status', 'active')
+            if type(status) is not str:
+                status = str(status)
+
+            expiry = mi_get('expiry_date')
+            reset = mi_get('reset_count')
+            reset_time_display = str(mi_get('reset_time') or '-')
+            # Truncate long reset_time values for display
+            if len(reset_time_display) > 15:
+                reset_time_display = reset_time_display[:12] + '...'
+
+            rows.append((
+                platform,
+                model,
+                total,
+                used,
+                remaining,
+                progress_display,
+                status,
+                str(expiry) if expiry else '-',
+                str(reset) if reset is not None else '-',
+                reset_time_display,
+                package,
+            ))
+
+    return rows
 
-            row = f"{platform:<15} {model:<30} {total:<12.0f} {used:<12.0f} {remaining:<12.0f} {progress_display:<11} {status:<8}"
-            if show_expiry:
-                expiry = model_info.get('expiry_date')
-                expiry_display = str(expiry) if expiry else '-'
-                row += f" {expiry_display:<11}"
-            if show_reset:
-                reset = model_info.get('reset_count')
-                reset_display = str(reset) if reset is not None else '-'
-                row += f" {reset_display:<9}"
-            if show_reset_time:
-                reset_time = model_info.get('reset_time')
-                reset_time_display = str(reset_time) if reset_time else '-'
-                # Truncate long reset_time values for display
-                if len(reset_time_display) > 15:
-                    reset_time_display = reset_time_display[:12] + '...'
-                row += f" {reset_time_display:<15}"
-            row += f" {package:<15}"
-            lines.append(row)
-
-            total_all_tokens += total
-            total_used_tokens += used
-            total_remaining_tokens += remaining
-
-    lines.append("-" * total_width)
-    footer = f"{'Total Tokens':<53} {total_all_tokens:<12.0f} {total_used_tokens:<12.0f} {total_remaining_tokens:<12.0f} {'-':<11} {'-':<8}"
+def _format_model_table(platform_tokens: List[Dict[str, Any]], target_currency: str = 'CNY', show_expiry: bool = False, show_reset: bool = False, show_reset_time: bool = False) -> str:
+    """Format model tokens as detailed table"""
+    # Write straight into one buffer rather than growing a list of lines
+    buf = io.StringIO()
+    write = buf.write
+
+    # Calculate column widths based on what we're showing
+    base_width = 125
+    extra_width = 0
     if show_expiry:
-        footer += f" {'-':<11}"
+        extra_width += 12
     if show_reset:
-        footer += f" {'-':<9}"
+        extra_width += 10
     if show_reset_time:
-        footer += f" {'-':<15}"
-    footer += f" {'-':<15}"
-    lines.append(footer)
-    lines.append("=" * total_width)
+        extra_width += 16
+
+    total_width = base_width + extra_width
+
+    write("=" * total_width + "\n")
+
+    # Build column layout once - Expiry, Resets, ResetTime before Package
+    # (field, title, width, numeric format or truncating precision)
+    columns = [
+        ('platform', 'Platform', 15, ''),
+        ('model', 'Model', 30, '.30'),
+        ('total', 'Total', 12, '.0f'),
+        ('used', 'Used', 12, '.0f'),
+        ('remaining', 'Remaining', 12, '.0f'),
+        ('progress', 'Progress %', 11, ''),
+        ('status', 'Status', 8, '.8'),
+    ]
+    if show_expiry:
+        columns.append(('expiry', 'Expiry', 11, ''))
+    if show_reset:
+        columns.append(('reset', 'Resets', 9, ''))
+    if show_reset_time:
+        columns.append(('reset_time', 'ResetTime', 15, ''))
+    columns.append(('package', 'Package', 15, ''))
+
+    header = ' '.join(f"{title:<{width}}" for _, title, width, _ in columns)
+    # Positional template over the normalized row tuples; unused fields are simply ignored
+    row_fmt = ' '.join(
+        f"{{{_TABLE_ROW_FIELDS.index(field)}:<{width}{spec}}}" for field, _, width, spec in columns
+    ) + "\n"
+    # Footer: label spans platform+model, then token totals, then '-' for the remaining columns
+    footer_fmt = "{label:<53} {total:<12.0f} {used:<12.0f} {remaining:<12.0f}" + ''.join(
+        f" {'-':<{width}}" for _, _, width, _ in columns[5:]
+    )
+
+    write(header + "\n")
+    write("-" * total_width + "\n")
+    
+    total_all_tokens = 0
+    total_used_tokens = 0
+    total_remaining_tokens = 0
+    
+    for row in _normalize_table_rows(platform_tokens):
+        if row[1] is None:
+            write(f"{row[0]:<15} {'No data':<30} {'-':<12} {'-':<12} {'-':<12} {'-':<11} {'-':<8} {'-':<15}\n")
+            continue
+
+        write(row_fmt.format(*row))
+        total_all_tokens += row[2]
+        total_used_tokens += row[3]
+        total_remaining_tokens += row[4]
+
+    write("-" * total_width + "\n")
+    write(footer_fmt.format_map({
+        'label': 'Total Tokens',
+        'total': total_all_tokens,
+        'used': total_used_tokens,
+        'remaining': total_remaining_tokens,
+    }))
+    write("\n" + "=" * total_width)
     
-    return '\n'.join(lines)
+    return buf.getvalue()
 
-def _format_model_json(platform_tokens: List[Dict[str, Any]]) -> str:
-    """Format model tokens as JSON"""
-    # Clean the data to make it JSON serializable
-    cleaned_tokens = _clean_for_json(platform_tokens)
-    return json.dumps(cleaned_tokens, indent=2, ensure_ascii=False)
+def _format_model_json(platform_tokens: List[Dict[str, Any]], compact: bool = False) -> str:
+    """Format model tokens as JSON (single-line with compact=True, for piping to tools)"""
+    # Non-serializable values are converted by the encoder as it meets them
+    if orjson is not None:
+        try:
+            option = _ORJSON_OPTIONS if compact else _ORJSON_OPTIONS | orjson.OPT_INDENT_2
+            return orjson.dumps(platform_tokens, default=json_default, option=option).decode('utf-8')
+        except TypeError:
+            # e.g. integers beyond 64 bits - let the stdlib encoder handle it
+            pass
+    if compact:
+        return json.dumps(platform_tokens, separators=(',', ':'), ensure_ascii=False, default=json_default)
+    return json.dumps(platform_tokens, indent=2, ensure_ascii=False, default=json_default)
 
 def _format_model_markdown(platform_tokens: List[Dict[str, Any]], show_expiry: bool = False, show_reset: bool = False, show_reset_time: bool = False) -> str:
     """Format model tokens as markdown table"""
-    lines = ["# LLM Model Token Statistics\n"]
+    # Build column layout once - Expiry, Resets, ResetTime before Package
+    # (title, separator, row field)
+    columns = [
+        ('Platform', '----------', '{platform}'),
+        ('Model', '-------', '{model}'),
+        ('Total', '-------', '{total:.0f}'),
+        ('Used', '------', '{used:.0f}'),
+        ('Remaining', '-----------', '{remaining:.0f}'),
+        ('Progress %', '------------', '{progress_pct}'),
+        ('Status', '--------', '{status}'),
+    ]
+    if show_expiry:
+        columns.append(('Expiry', '---------', '{expiry}'))
+    if show_reset:
+        columns.append(('Resets', '--------', '{reset}'))
+    if show_reset_time:
+        columns.append(('ResetTime', '-------------', '{reset_time}'))
+    columns.append(('Package', '---------', '{package}'))
+
+    header = "| " + " | ".join(title for title, _, _ in columns) + " |\n"
+    separator = "|" + "|".join(sep for _, sep, _ in columns) + "|\n"
+    row_fmt = "| " + " | ".join(field for _, _, field in columns) + " |\n"
+
+    # Every line is newline-terminated; the trailing one is dropped on return
+    buf = io.StringIO()
+    write = buf.write
+    write("# LLM Model Token Statistics\n\n")
 
     for platform_data in platform_tokens:
         platform = platform_data['platform']
         models = platform_data.get('models', [])
 
         if models:
-            lines.append(f"## {platform}\n")
-
-            # Build header dynamically - Expiry, Resets, ResetTime before Package
-            header = "| Platform | Model | Total | Used | Remaining | Progress % | Status |"
-            if show_expiry:
-                header += " Expiry |"
-            if show_reset:
-                header += " Resets |"
-            if show_reset_time:
-                header += " ResetTime |"
-            header += " Package |"
-            lines.append(header)
-
-            # Build separator dynamically
-            separator = "|----------|-------|-------|------|-----------|------------|--------|"
-            if show_expiry:
-                separator += "---------|"
-            if show_reset:
-                separator += "--------|"
-            if show_reset_time:
-                separator += "-------------|"
-            separator += "---------|"
-            lines.append(separator)
+            write(f"## {platform}\n\n")
+            write(header)
+            write(separator)
 
             for model_info in models:
                 model = model_info['model']
-                package = model_info.get('package', model)
                 total = model_info['total_tokens']
                 used = model_info['used_tokens']
-                remaining = model_info['remaining_tokens']
 
                 # Calculate progress percentage or display "-"
                 if total > 0:
@@ -269,27 +329,27 @@ def _format_model_markdown(platform_tokens: List[Dict[str, Any]], show_expiry: b
                 else:
                     progress_pct = "-"
 
-                # Get status with default fallback
-                status = model_info.get('status', 'active')
-                row = f"| {platform} | {model} | {total:.0f} | {used:.0f} | {remaining:.0f} | {progress_pct} | {status} |"
-                if show_expiry:
-                    expiry = model_info.get('expiry_date')
-                    expiry_display = expiry if expiry else '-'
-                    row += f" {expiry_display} |"
-                if show_reset:
-                    reset = model_info.get('reset_count')
-                    reset_display = str(reset) if reset is not None else '-'
-                    row += f" {reset_display} |"
-                if show_reset_time:
-                    reset_time = model_info.get('reset_time')
-                    reset_time_display = str(reset_time) if reset_time else '-'
-                    row += f" {reset_time_display} |"
-                row += f" {package} |"
-                lines.append(row)
-
-            lines.append("")
-
-    return '\n'.join(lines)
+                expiry = model_info.get('expiry_date')
+                reset = model_info.get('reset_count')
+                reset_time = model_info.get('reset_time')
+                write(row_fmt.format_map({
+                    'platform': platform,
+                    'model': model,
+                    'total': total,
+                    'used': used,
+                    'remaining': model_info['remaining_tokens'],
+                    'progress_pct': progress_pct,
+                    # Get status with default fallback
+                    'status': model_info.get('status', 'active'),
+                    'expiry': expiry if expiry else '-',
+                    'reset': str(reset) if reset is not None else '-',
+                    'reset_time': str(reset_time) if reset_time else '-',
+                    'package': model_info.get('package', model),
+                }))
+
+            write("\n")
+
+    return buf.getvalue()[:-1]
 
 def _format_model_total(platform_tokens: List[Dict[str, Any]], target_currency: str = 'CNY') -> str:
     """Format total tokens across all models"""
@@ -302,53 +362,47 @@ def _format_model_total(platform_tokens: List[Dict[str, Any]], target_currency:
     
     return f"Total available tokens across all models: {total_tokens:.0f} tokens"
 
-def _filter_tokens_by_model(platform_tokens: List[Dict[str, Any]], model: str) -> List[Dict[str, Any]]:
-    """Filter tokens by model name"""
-    filtered_tokens = []
+def _filter_platform_models(platform_tokens: List[Dict[str, Any]], keep) -> List[Dict[str, Any]]:
+    """Keep models for which keep(model_info) is true, dropping platforms left empty
+    
+    Single pass, so each model is tested (and its strings lowercased) only once.
+    Platforms whose models all pass are reused as-is, and the input list itself
+    is returned when nothing was dropped.
+    """
+    filtered_tokens: List[Dict[str, Any]] = []
+    changed = False
 
     for platform_data in platform_tokens:
-        platform = platform_data['platform']
         models = platform_data.get('models', [])
-        
-        # Filter models by model name
-        filtered_models = []
-        for model_info in models:
-            # Check model name for matching
-            model_name = model_info.get('model', '').lower()
-            target_model = model.lower()
-            
-            # Match if model name contains target model
-            if target_model in model_name:
-                filtered_models.append(model_info)
-        
-        if filtered_models:  # Only include platforms with matching models
+        kept_models = [model_info for model_info in models if keep(model_info)]
+
+        if not kept_models:
+            changed = True
+        elif len(kept_models) == len(models):
+            filtered_tokens.append(platform_data)
+        else:
+            changed = True
             filtered_tokens.append({
-                'platform': platform,
-                'models': filtered_models,
+                'platform': platform_data.get('platform'),
+                'models': kept_models,
                 'raw_data': platform_data.get('raw_data', {})
             })
 
-    return filtered_tokens
+    return filtered_tokens if changed else platform_tokens
+
+def _filter_tokens_by_model(platform_tokens: List[Dict[str, Any]], model: str) -> List[Dict[str, Any]]:
+    """Filter tokens by model name"""
+    target_model = model.lower()
+    # Match if model name contains target model
+    return _filter_platform_models(
+        platform_tokens,
+        lambda model_info: target_model in model_info.get('model', '').lower()
+    )
 
 
 def _filter_out_inactive(platform_tokens: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Remove models marked as inactive from the token list"""
-    filtered_tokens: List[Dict[str, Any]] = []
-
-    for platform_data in platform_tokens:
-        models = platform_data.get('models', [])
-        active_models = []
-
-        for model_info in models:
-            status = str(model_info.get('status', 'active')).lower()
-            if status != 'inactive':
-                active_models.append(model_info)
-
-        if active_models:
-            filtered_tokens.append({
-                'platform': platform_data.get('platform'),
-                'models': active_models,
-                'raw_data': platform_data.get('raw_data', {})
-            })
-
-    return filtered_tokens
+    return _filter_platform_models(
+        platform_tokens,
+        lambda model_info: str(model_info.get('status', 'active')).lower() != 'inactive'
+    )
@@ -2,68 +2,99 @@
 Utility functions for balance checking
 """
 
+import hashlib
+import io
 import json
-from typing import Dict, Any, List, Union, Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, Mapping, Tuple, TypeVar, Union, Optional
 from pathlib import Path
 import os
+import sys
+
+# Sentinel for keys missing from a mapping (None can be a real value)
+_MISSING = object()
 
 def get_nested_value(data: Dict[str, Any], path: List[str]) -> Any:
     """Get nested value from dictionary using path"""
     current = data
     for key in path:
-        if isinstance(current, dict) and key in current:
-            current = current[key]
-        else:
+        # One dict.get per level; non-mappings have no .get and end the walk
+        try:
+            current = current.get(key, _MISSING)
+        except AttributeError:
+            return None
+        if current is _MISSING:
             return None
     return current
 
-def get_exchange_rates() -> Dict[str, float]:
-    """Get exchange rates with simple default values"""
-    # Default exchange rates (to CNY)
-    default_rates = {
-        'CNY': 1.0,
-        'USD': 7.2,
-        'EUR': 7.8,
-        'GBP': 9.1,
-        'JPY': 0.048,
-        'KRW': 0.0054,
-        'CAD': 5.3,
-        'AUD': 4.7,
-        'CHF': 8.1,
-        'HKD': 0.92,
-        'SGD': 5.4,
-        'Points': 0.01  # for platform-specific points
-    }
-    
+def get_exchange_rates() -> Mapping[str, float]:
+    """Get exchange rates with simple default values (read-only mapping)"""
+    return _load_exchange_rates()
+
+# Default exchange rates (to CNY), shared read-only when no override is set
+_DEFAULT_RATES: Mapping[str, float] = MappingProxyType({
+    'CNY': 1.0,
+    'USD': 7.2,
+    'EUR': 7.8,
+    'GBP': 9.1,
+    'JPY': 0.048,
+    'KRW': 0.0054,
+    'CAD': 5.3,
+    'AUD': 4.7,
+    'CHF': 8.1,
+    'HKD': 0.92,
+    'SGD': 5.4,
+    'Points': 0.01  # for platform-specific points
+})
+
+@lru_cache(maxsize=1)
+def _load_exchange_rates() -> Mapping[str, float]:
+    """Build the exchange rate table once per process (LLM_BALANCE_RATES is read on first use)"""
     # Allow override via environment variable
     rates_env = os.getenv('LLM_BALANCE_RATES')
     if rates_env:
         try:
-            custom_rates = json.loads(rates_env)
-            default_rates.update(custom_rates)
+            rates = dict(_DEFAULT_RATES)
+            # Intern currency codes to match the interned codes on balance rows
+            rates.update((sys.intern(k), v) for k, v in json.loads(rates_env).items())
+            return MappingProxyType(rates)
         except:
             pass  # Use default if parsing fails
     
-    return default_rates
+    return _DEFAULT_RATES
+
+@lru_cache(maxsize=1)
+def _sorted_currencies() -> Tuple[str, ...]:
+    """Currency codes in display order, sorted once"""
+    return tuple(sorted(_load_exchange_rates()))
 
 def convert_currency(amount: float, from_currency: str, to_currency: str = 'CNY') -> float:
     """Convert amount from one currency to another using exchange rates"""
     if from_currency == to_currency:
         return amount
     
-    rates = get_exchange_rates()
-    
-    # Convert to CNY first, then to target currency
-    from_rate = rates.get(from_currency, 1.0)
+    # One dict lookup and a multiply: amount * (from_currency / CNY) * (CNY / to_currency)
+    factors = _conversion_factors(to_currency)
+    factor = factors.get(from_currency)
+    if factor is None:
+        # Unknown source currency is treated as CNY-valued (rate 1.0)
+        factor = 1.0 / _load_exchange_rates().get(to_currency, 1.0)
+    return amount * factor
+
+@lru_cache(maxsize=16)
+def _conversion_factors(to_currency: str) -> Mapping[str, float]:
+    """Multipliers converting every known currency to to_currency, computed once per target"""
+    rates = _load_exchange_rates()
     to_rate = rates.get(to_currency, 1.0)
-    
-    # Convert: amount * (from_currency / CNY) * (CNY / to_currency)
-    return amount * (from_rate / to_rate)
+    return MappingProxyType({currency: rate / to_rate for currency, rate in rates.items()})
 
 def get_available_currencies() -> List[str]:
     """Get list of available currencies"""
-    rates = get_exchange_rates()
-    return sorted(rates.keys())
+    return list(_sorted_currencies())
 
 def get_proxy_config() -> Optional[Dict[str, str]]:
     """Get proxy configuration from environment variables"""
@@ -97,20 +128,165 @@ export HTTP_PROXY="socks5://127.0.0.1:1080"
 export HTTPS_PROXY="socks5://127.0.0.1:1080"
 """
 
+# Environment variables that can carry credentials or pick the account/endpoint a platform queries
+_CREDENTIAL_ENV_PATTERN = re.compile(r'(?:KEY|TOKEN|SECRET|COOKIES?|AUTHORIZATION|_ID|_URL)$')
+
+_T = TypeVar('_T')
+
+# Upper bound on worker threads. Checks are I/O bound, so every platform gets its own
+# worker: wall time is the slowest platform, not ceil(N/5) rounds.
+MAX_WORKERS = 32
+
+def map_concurrently(fn: Callable[[str], _T], names: List[str], max_workers: int = MAX_WORKERS) -> List[_T]:
+    """Apply fn to each name on a thread pool, returning results in the given order"""
+    if len(names) <= 1:
+        return [fn(name) for name in names]
+    with ThreadPoolExecutor(max_workers=min(len(names), max_workers)) as executor:
+        return list(executor.map(fn, names))
+
+def print_line(message: str = ''):
+    """Print message and its newline in one write, so lines from worker threads don't interleave"""
+    print(f"{message}\n", end='')
+
+def cache_fingerprint(platform_config) -> str:
+    """Short hash of everything that selects the account a platform's results belong to
+    
+    Covers the merged platform configuration (so config.yaml edits count), the
+    credential-like environment variables and the platform's
+    ~/.llm_balance/<name>_config.yaml side file. Result caches include it in their
+    key, so an entry fetched with old credentials is never served.
+    """
+    env = sorted((k, v) for k, v in os.environ.items() if _CREDENTIAL_ENV_PATTERN.search(k))
+    side_file = Path.home() / '.llm_balance' / f'{platform_config.name}_config.yaml'
+    try:
+        stat = side_file.stat()
+        side = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        side = None
+    payload = repr((platform_config, env, side)).encode('utf-8', 'surrogatepass')
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+def is_error_result(raw_data) -> bool:
+    """Whether a handler returned an error placeholder instead of real data
+    
+    Several handlers catch their own failures and return zeroed results with
+    raw_data={'error': ...}; those must not be cached as if they were real.
+    """
+    return isinstance(raw_data, dict) and 'error' in raw_data
+
+# How _clean_for_json treats a value
+_KIND_SCALAR, _KIND_DICT, _KIND_LIST, _KIND_OBJECT, _KIND_OTHER = range(5)
+
+# Exact-type dispatch for the common cases; subclasses and other objects fall back to _clean_kind
+_CLEAN_KINDS = {
+    str: _KIND_SCALAR,
+    int: _KIND_SCALAR,
+    float: _KIND_SCALAR,
+    bool: _KIND_SCALAR,
+    type(None): _KIND_SCALAR,
+    dict: _KIND_DICT,
+    list: _KIND_LIST,
+}
+
+# Nesting depth past which _clean_for_json replaces values with a placeholder (guards against cycles)
+_CLEAN_MAX_DEPTH = 1000
+
+def _clean_kind(value) -> int:
+    """Classify a value whose exact type is not in _CLEAN_KINDS"""
+    if isinstance(value, dict):
+        return _KIND_DICT
+    if isinstance(value, list):
+        return _KIND_LIST
+    if getattr(value, '__dict__', None) is not None:
+        return _KIND_OBJECT
+    if isinstance(value, (str, int, float, bool)):
+        return _KIND_SCALAR
+    return _KIND_OTHER
+
 def _clean_for_json(obj):
-    """Clean object for JSON serialization"""
-    if isinstance(obj, dict):
-        return {k: _clean_for_json(v) for k, v in obj.items() if not k.startswith('_')}
-    elif isinstance(obj, list):
-        return [_clean_for_json(item) for item in obj]
-    elif hasattr(obj, '__dict__'):
-        # Convert object to dict, skipping private attributes
-        return {k: _clean_for_json(v) for k, v in obj.__dict__.items() if not k.startswith('_')}
-    elif isinstance(obj, (str, int, float, bool)) or obj is None:
-        return obj
-    else:
-        # For other objects, convert to string
-        return str(obj)
+    """Clean object for JSON serialization
+    
+    Walks with an explicit stack instead of recursing, so deeply nested raw_data
+    costs no Python frame per level and cannot hit the recursion limit.
+    """
+    root = [None]
+    # Work items: clean `value` and store the result in container[slot]
+    stack = [(root, 0, obj, 0)]
+    kinds_get = _CLEAN_KINDS.get
+    while stack:
+        container, slot, value, depth = stack.pop()
+        kind = kinds_get(type(value))
+        if kind is None:
+            kind = _clean_kind(value)
+
+        if kind == _KIND_SCALAR:
+            container[slot] = value
+            continue
+        if depth > _CLEAN_MAX_DEPTH:
+            container[slot] = f"<{value.__class__.__name__} object>"
+            continue
+        if kind == _KIND_DICT:
+            items = value.items()
+        elif kind == _KIND_LIST:
+            cleaned_list = [None] * len(value)
+            container[slot] = cleaned_list
+            stack.extend((cleaned_list, i, item, depth + 1) for i, item in enumerate(value))
+            continue
+        elif kind == _KIND_OBJECT:
+            # Convert object to dict, skipping private attributes
+            items = vars(value).items()
+        else:
+            # For other objects, convert to string
+            container[slot] = str(value)
+            continue
+
+        cleaned = {}
+        container[slot] = cleaned
+        for k, v in items:
+            if not k.startswith('_'):
+                # Reserve the key now so the output keeps the input's key order
+                cleaned[k] = None
+                stack.append((cleaned, k, v, depth + 1))
+    return root[0]
+
+def _is_json_clean(obj) -> bool:
+    """Whether obj would come out of _clean_for_json unchanged
+    
+    True when the tree holds only plain dicts, lists and JSON scalars and no
+    dict key starts with '_'; such data can be dumped as-is without building
+    a cleaned copy. Stops at the first value that needs cleaning.
+    """
+    stack = [(obj, 0)]
+    kinds_get = _CLEAN_KINDS.get
+    while stack:
+        value, depth = stack.pop()
+        kind = kinds_get(type(value))
+        if kind == _KIND_SCALAR:
+            continue
+        if kind is None or depth > _CLEAN_MAX_DEPTH:
+            return False
+        if kind == _KIND_DICT:
+            for k, v in value.items():
+                if type(k) is not str or k.startswith('_'):
+                    return False
+                stack.append((v, depth + 1))
+        else:
+            stack.extend((item, depth + 1) for item in value)
+    return True
+
+def json_default(obj):
+    """json.dumps fallback, only called for values it cannot encode natively"""
+    obj_name = obj.__class__.__name__
+    # Convert objects to dicts, skipping Configuration objects
+    if obj_name == 'Configuration' or not hasattr(obj, '__dict__'):
+        return f"<{obj_name} object>"
+    return obj.__dict__
+
+def _dumps_clean(obj) -> str:
+    """Serialize obj as _clean_for_json would, copying it only when it needs cleaning"""
+    if not _is_json_clean(obj):
+        obj = _clean_for_json(obj)
+    return json.dumps(obj, indent=2, ensure_ascii=False)
 
 def format_output(balances: List[Dict[str, Any]], format_type: str = 'table', target_currency: str = 'CNY') -> str:
     """Format balance output in different formats"""
@@ -118,18 +294,33 @@ def format_output(balances: List[Dict[str, Any]], format_type: str = 'table', ta
         return "No balance data available"
     
     if format_type == 'json':
-        # Clean data for JSON serialization
-        clean_balances = _clean_for_json(balances)
-        return json.dumps(clean_balances, indent=2, ensure_ascii=False)
+        return _dumps_clean(balances)
     
-    elif format_type == 'markdown':
-        return _format_markdown(balances)
+    # Sniff the row shape once for whichever formatter runs
+    is_tokens, has_spent = _detect_mode(balances)
+
+    if format_type == 'markdown':
+        return _format_markdown(balances, is_tokens, has_spent)
     
     elif format_type == 'total':
-        return _format_total(balances, target_currency)
+        return _format_total(balances, target_currency, is_tokens, has_spent)
     
     else:  # table format
-        return _format_table(balances, target_currency)
+        return _format_table(balances, target_currency, is_tokens, has_spent)
+
+def _detect_mode(balances: List[Dict[str, Any]]) -> Tuple[bool, bool]:
+    """Return (is_tokens, has_spent) for a list of rows
+    
+    Rows from one check share a shape, so the first row decides; only when it has
+    neither 'tokens' nor 'spent' are all rows scanned.
+    """
+    first = balances[0] if balances else {}
+    if 'tokens' in first or 'spent' in first:
+        return 'tokens' in first, 'spent' in first
+    return (
+        any('tokens' in balance for balance in balances),
+        any('spent' in balance for balance in balances),
+    )
 
 def _parse_display_number(value: Any) -> Optional[float]:
     """Parse display number with '-' and None support"""
@@ -140,38 +331,51 @@ def _parse_display_number(value: Any) -> Optional[float]:
     except (ValueError, TypeError):
         return None
 
-def _format_table(balances: List[Dict[str, Any]], target_currency: str = 'CNY') -> str:
+# Fields every cost row has, fetched in one call
+_PLATFORM_CURRENCY = itemgetter('platform', 'currency')
+
+# Row templates for _format_table, compiled once: tokens / balance+spent / balance
+_TOKEN_ROW_FMT = "%-20s %-15.2f %-10s\n"
+_SPENT_ROW_FMT = "%-20s %-15s %-15s %-10s\n"
+_BALANCE_ROW_FMT = "%-20s %-15s %-10s\n"
+
+def _sum_by_currency(sums: Dict[str, float], currency: str, amount: float):
+    """Accumulate an amount into its currency's running sum"""
+    sums[currency] = sums.get(currency, 0.0) + amount
+
+def _convert_sums(sums: Dict[str, float], target_currency: str) -> float:
+    """Convert per-currency sums to the target currency (one conversion per currency, not per row)"""
+    return sum(convert_currency(amount, currency, target_currency) for currency, amount in sums.items())
+
+def _format_table(balances: List[Dict[str, Any]], target_currency: str = 'CNY',
+                  is_tokens: bool = False, has_spent: bool = False) -> str:
     """Format as text table"""
-    lines = []
-    lines.append("=" * 80)
-    
-    # Check if this is token data or balance data
-    is_tokens = any('tokens' in balance for balance in balances)
-    has_spent = any('spent' in balance for balance in balances)
+    # Every line is newline-terminated; the trailing one is dropped on return
+    buf = io.StringIO()
+    write = buf.write
+    write("=" * 80 + "\n")
     
     if is_tokens:
-        lines.append(f"{'Platform':<20} {'Tokens':<15} {'Currency':<10}")
+        write(f"{'Platform':<20} {'Tokens':<15} {'Currency':<10}\n")
     elif has_spent:
-        lines.append(f"{'Platform':<20} {'Balance':<15} {'Spent':<15} {'Currency':<10}")
+        write(f"{'Platform':<20} {'Balance':<15} {'Spent':<15} {'Currency':<10}\n")
     else:
-        lines.append(f"{'Platform':<20} {'Balance':<15} {'Currency':<10}")
+        write(f"{'Platform':<20} {'Balance':<15} {'Currency':<10}\n")
     
-    lines.append("-" * 80)
+    write("-" * 80 + "\n")
     
-    total = 0
-    total_spent = 0
+    # Per-currency sums, converted once after the loop
+    total_by_currency: Dict[str, float] = {}
+    spent_by_currency: Dict[str, float] = {}
     for balance in balances:
-        platform = balance['platform']
+        platform, currency = _PLATFORM_CURRENCY(balance)
         
         # Handle both balance and token data
         if 'tokens' in balance:
             amount = balance['tokens']
-            currency = balance['currency']
             row_has_spent = False
         else:
             amount = balance.get('balance', 0)
-            currency = balance['currency']
-            spent = balance.get('spent', 0)
             row_has_spent = 'spent' in balance
         
         amount_parsed = _parse_display_number(amount)
@@ -188,62 +392,62 @@ def _format_table(balances: List[Dict[str, Any]], target_currency: str = 'CNY')
                 spent_display = f"{spent_float:.2f}"
         
         if is_tokens:
-            lines.append(f"{platform:<20} {amount_float:<15.2f} {currency:<10}")
+            write(_TOKEN_ROW_FMT % (platform, amount_float, currency))
         elif row_has_spent:
-            lines.append(f"{platform:<20} {amount_display:<15} {spent_display:<15} {currency:<10}")
+            write(_SPENT_ROW_FMT % (platform, amount_display, spent_display, currency))
         else:
-            lines.append(f"{platform:<20} {amount_display:<15} {currency:<10}")
+            write(_BALANCE_ROW_FMT % (platform, amount_display, currency))
         
         # Convert to target currency for total
         if amount_is_numeric:  # Add to total if we have valid numeric data (including negative)
-            total += convert_currency(amount_float, currency, target_currency)
+            _sum_by_currency(total_by_currency, currency, amount_float)
         
         # Add spent to total spent
         if row_has_spent and spent_float > 0:
-            total_spent += convert_currency(spent_float, currency, target_currency)
+            _sum_by_currency(spent_by_currency, currency, spent_float)
     
-    lines.append("-" * 80)
+    total = _convert_sums(total_by_currency, target_currency)
+    total_spent = _convert_sums(spent_by_currency, target_currency)
+
+    write("-" * 80 + "\n")
     
     if has_spent:
-        lines.append(f"{'Total (' + target_currency + ')':<20} {total:<15.2f} {total_spent:<15.2f} {target_currency:<10}")
+        write(f"{'Total (' + target_currency + ')':<20} {total:<15.2f} {total_spent:<15.2f} {target_currency:<10}\n")
     else:
-        lines.append(f"{'Total (' + target_currency + ')':<20} {total:<15.2f} {target_currency:<10}")
+        write(f"{'Total (' + target_currency + ')':<20} {total:<15.2f} {target_currency:<10}\n")
     
-    lines.append("=" * 80)
+    write("=" * 80 + "\n")
     
-    return '\n'.join(lines)
+    return buf.getvalue()[:-1]
 
-def _format_markdown(balances: List[Dict[str, Any]]) -> str:
+def _format_markdown(balances: List[Dict[str, Any]], is_tokens: bool = False, has_spent: bool = False) -> str:
     """Format as markdown table"""
-    # Check if this is token data or balance data
-    is_tokens = any('tokens' in balance for balance in balances)
-    has_spent = any('spent' in balance for balance in balances)
-    
+    # Every line is newline-terminated; the trailing one is dropped on return
+    buf = io.StringIO()
+    write = buf.write
     if is_tokens:
-        lines = ["# LLM Platform Tokens\n"]
-        lines.append("| Platform | Tokens | Currency |")
-        lines.append("|----------|---------|----------|")
+        write("# LLM Platform Tokens\n\n")
+        write("| Platform | Tokens | Currency |\n")
+        write("|----------|---------|----------|\n")
     elif has_spent:
-        lines = ["# LLM Platform Costs\n"]
-        lines.append("| Platform | Balance | Spent | Currency |")
-        lines.append("|----------|---------|-------|----------|")
+        write("# LLM Platform Costs\n\n")
+        write("| Platform | Balance | Spent | Currency |\n")
+        write("|----------|---------|-------|----------|\n")
     else:
-        lines = ["# LLM Platform Costs\n"]
-        lines.append("| Platform | Balance | Currency |")
-        lines.append("|----------|---------|----------|")
+        write("# LLM Platform Costs\n\n")
+        write("| Platform | Balance | Currency |\n")
+        write("|----------|---------|----------|\n")
     
     for balance in balances:
-        platform = balance['platform']
+        platform, currency = _PLATFORM_CURRENCY(balance)
         
         # Handle both balance and token data
         if 'tokens' in balance:
             amount = balance['tokens']
-            currency = balance['currency']
-            lines.append(f"| {platform} | {amount:.2f} | {currency} |")
+            write(f"| {platform} | {amount:.2f} | {currency} |\n")
         else:
             amount = balance.get('balance', 0)
             spent = balance.get('spent', 0)
-            currency = balance['currency']
             
             amount_parsed = _parse_display_number(amount)
             amount_display = '-' if amount_parsed is None else f"{amount_parsed:.2f}"
@@ -251,27 +455,25 @@ def _format_markdown(balances: List[Dict[str, Any]]) -> str:
             spent_display = '-' if spent_parsed is None else f"{spent_parsed:.2f}"
             
             if has_spent:
-                lines.append(f"| {platform} | {amount_display} | {spent_display} | {currency} |")
+                write(f"| {platform} | {amount_display} | {spent_display} | {currency} |\n")
             else:
-                lines.append(f"| {platform} | {amount_display} | {currency} |")
+                write(f"| {platform} | {amount_display} | {currency} |\n")
     
-    return '\n'.join(lines)
+    return buf.getvalue()[:-1]
 
-def _format_total(balances: List[Dict[str, Any]], target_currency: str = 'CNY') -> str:
+def _format_total(balances: List[Dict[str, Any]], target_currency: str = 'CNY',
+                  is_tokens: bool = False, has_spent: bool = False) -> str:
     """Format as total only"""
-    total = 0.0
-    total_spent = 0.0
-    
-    # Check if this is token data or balance data
-    is_tokens = any('tokens' in balance for balance in balances)
-    has_spent = any('spent' in balance for balance in balances)
+    # Per-currency sums, converted once after the loop
+    total_by_currency: Dict[str, float] = {}
+    spent_by_currency: Dict[str, float] = {}
     
     for balance in balances:
         # Handle both balance and token data
         if 'tokens' in balance:
             amount = balance['tokens']
             currency = balance['currency']
-            total += convert_currency(amount, currency, target_currency)
+            _sum_by_currency(total_by_currency, currency, amount)
         else:
             amount = balance.get('balance', 0)
             spent = balance.get('spent', 0)
@@ -279,11 +481,14 @@ def _format_total(balances: List[Dict[str, Any]], target_currency: str = 'CNY')
             
             # Only include numeric amounts in totals (including negative)
             if isinstance(amount, (int, float)) and amount != 0:
-                total += convert_currency(float(amount), currency, target_currency)
+                _sum_by_currency(total_by_currency, currency, float(amount))
             
             if has_spent and isinstance(spent, (int, float)):
-                total_spent += convert_currency(float(spent), currency, target_currency)
+                _sum_by_currency(spent_by_currency, currency, float(spent))
     
+    total = _convert_sums(total_by_currency, target_currency)
+    total_spent = _convert_sums(spent_by_currency, target_currency)
+
     if is_tokens:
         return f"Total tokens: {total:.2f} {target_currency}"
     elif has_spent:
@@ -374,135 +579,136 @@ def _format_platform_info_json(cost_info, package_info, plan_info) -> str:
     else:
         result['plan'] = {'message': '该平台不支持编码计划监控'}
     
-    clean_result = _clean_for_json(result)
-    return json.dumps(clean_result, indent=2, ensure_ascii=False)
+    return _dumps_clean(result)
 
 def _format_platform_info_markdown(cost_info, package_info, plan_info, target_currency: str) -> str:
     """Format platform info as markdown"""
-    lines = []
+    buf = io.StringIO()
+    write = buf.write
     
     if cost_info:
         platform_name = cost_info.platform
-        lines.append(f"# {platform_name} 平台信息\n")
+        write(f"# {platform_name} 平台信息\n\n")
         
-        lines.append("## 费用信息\n")
-        lines.append("| 项目 | 数值 | 货币 |")
-        lines.append("|------|------|------|")
+        write("## 费用信息\n\n")
+        write("| 项目 | 数值 | 货币 |\n")
+        write("|------|------|------|\n")
         
         balance_display = f"{cost_info.balance:.2f}" if isinstance(cost_info.balance, (int, float)) else "-"
-        lines.append(f"| 余额 | {balance_display} | {cost_info.currency} |")
+        write(f"| 余额 | {balance_display} | {cost_info.currency} |\n")
         
         if cost_info.spent != "-" and cost_info.spent is not None:
             spent_display = f"{cost_info.spent:.2f}" if isinstance(cost_info.spent, (int, float)) else "-"
             spent_currency = cost_info.spent_currency or cost_info.currency
-            lines.append(f"| 已消费 | {spent_display} | {spent_currency} |")
+            write(f"| 已消费 | {spent_display} | {spent_currency} |\n")
         
         if target_currency != cost_info.currency:
             converted_balance = convert_currency(cost_info.balance, cost_info.currency, target_currency)
-            lines.append(f"| 余额({target_currency}) | {converted_balance:.2f} | {target_currency} |")
+            write(f"| 余额({target_currency}) | {converted_balance:.2f} | {target_currency} |\n")
     
     if package_info:
-        lines.append("\n## Token 使用情况\n")
-        lines.append("| 模型 | 套餐 | 剩余 Token | 已用 Token | 总 Token | 状态 |")
-        lines.append("|------|------|------------|------------|----------|------|")
+        write("\n## Token 使用情况\n\n")
+        write("| 模型 | 套餐 | 剩余 Token | 已用 Token | 总 Token | 状态 |\n")
+        write("|------|------|------------|------------|----------|------|\n")
         
         for model in package_info.models:
-            lines.append(
+            write(
                 f"| {model.model} | {model.package} | "
                 f"{model.remaining_tokens:,.0f} | {model.used_tokens:,.0f} | "
-                f"{model.total_tokens:,.0f} | {model.status} |"
+                f"{model.total_tokens:,.0f} | {model.status} |\n"
             )
             
             if model.expiry_date:
-                lines.append(f"| | 到期时间: {model.expiry_date} | | | | |")
+                write(f"| | 到期时间: {model.expiry_date} | | | | |\n")
             if model.reset_time:
-                lines.append(f"| | 重置时间: {model.reset_time} | | | | |")
+                write(f"| | 重置时间: {model.reset_time} | | | | |\n")
     else:
-        lines.append("\n## Token 使用情况\n")
-        lines.append("该平台不支持 token 监控")
+        write("\n## Token 使用情况\n\n")
+        write("该平台不支持 token 监控\n")
     
     if plan_info:
-        lines.append("\n## 编码计划使用情况\n")
-        lines.append(f"状态: {plan_info.status}")
+        write("\n## 编码计划使用情况\n\n")
+        write(f"状态: {plan_info.status}\n")
         if plan_info.update_time:
-            lines.append(f"更新时间: {plan_info.update_time}\n")
+            write(f"更新时间: {plan_info.update_time}\n\n")
         
-        lines.append("| 类型 | 已用百分比 | 重置时间 |")
-        lines.append("|------|-----------|---------|")
+        write("| 类型 | 已用百分比 | 重置时间 |\n")
+        write("|------|-----------|---------|\n")
         
         for quota in plan_info.quotas:
             reset_time_display = quota.reset_time if quota.reset_time else "-"
-            lines.append(f"| {quota.level.capitalize()} | {quota.percent:.1f}% | {reset_time_display} |")
+            write(f"| {quota.level.capitalize()} | {quota.percent:.1f}% | {reset_time_display} |\n")
     else:
-        lines.append("\n## 编码计划使用情况\n")
-        lines.append("该平台不支持编码计划监控")
+        write("\n## 编码计划使用情况\n\n")
+        write("该平台不支持编码计划监控\n")
     
-    return '\n'.join(lines)
+    return buf.getvalue()[:-1]
 
 def _format_platform_info_table(cost_info, package_info, plan_info, target_currency: str) -> str:
     """Format platform info as text table"""
-    lines = []
+    buf = io.StringIO()
+    write = buf.write
     
     if cost_info:
         platform_name = cost_info.platform
-        lines.append("=" * 80)
-        lines.append(f" {platform_name} 平台信息")
-        lines.append("=" * 80)
+        write("=" * 80 + "\n")
+        write(f" {platform_name} 平台信息\n")
+        write("=" * 80 + "\n")
         
-        lines.append("\n【费用信息】")
-        lines.append("-" * 80)
+        write("\n【费用信息】\n")
+        write("-" * 80 + "\n")
         
         balance_display = f"{cost_info.balance:.2f}" if isinstance(cost_info.balance, (int, float)) else "-"
-        lines.append(f"  余额:     {balance_display} {cost_info.currency}")
+        write(f"  余额:     {balance_display} {cost_info.currency}\n")
         
         if cost_info.spent != "-" and cost_info.spent is not None:
             spent_display = f"{cost_info.spent:.2f}" if isinstance(cost_info.spent, (int, float)) else "-"
             spent_currency = cost_info.spent_currency or cost_info.currency
-            lines.append(f"  已消费:   {spent_display} {spent_currency}")
+            write(f"  已消费:   {spent_display} {spent_currency}\n")
         
         if target_currency != cost_info.currency and isinstance(cost_info.balance, (int, float)):
             converted_balance = convert_currency(cost_info.balance, cost_info.currency, target_currency)
-            lines.append(f"  余额({target_currency}): {converted_balance:.2f} {target_currency}")
+            write(f"  余额({target_currency}): {converted_balance:.2f} {target_currency}\n")
     
     if package_info:
-        lines.append("\n【Token 使用情况】")
-        lines.append("-" * 80)
-        lines.append(f"{'模型':<20} {'套餐':<15} {'剩余Token':<15} {'已用Token':<15} {'总Token':<15} {'状态':<10}")
-        lines.append("-" * 80)
+        write("\n【Token 使用情况】\n")
+        write("-" * 80 + "\n")
+        write(f"{'模型':<20} {'套餐':<15} {'剩余Token':<15} {'已用Token':<15} {'总Token':<15} {'状态':<10}\n")
+        write("-" * 80 + "\n")
         
         for model in package_info.models:
-            lines.append(
+            write(
                 f"{model.model:<20} {model.package:<15} "
                 f"{model.remaining_tokens:<15,.0f} {model.used_tokens:<15,.0f} "
-                f"{model.total_tokens:<15,.0f} {model.status:<10}"
+                f"{model.total_tokens:<15,.0f} {model.status:<10}\n"
             )
             
             if model.expiry_date:
-                lines.append(f"  ↳ 到期时间: {model.expiry_date}")
+                write(f"  ↳ 到期时间: {model.expiry_date}\n")
             if model.reset_time:
-                lines.append(f"  ↳ 重置时间: {model.reset_time}")
+                write(f"  ↳ 重置时间: {model.reset_time}\n")
     else:
-        lines.append("\n【Token 使用情况】")
-        lines.append("-" * 80)
-        lines.append("  该平台不支持 token 监控")
+        write("\n【Token 使用情况】\n")
+        write("-" * 80 + "\n")
+        write("  该平台不支持 token 监控\n")
     
     if plan_info:
         from datetime import datetime
         
-        lines.append("\n【编码计划使用情况】")
-        lines.append("-" * 80)
+        write("\n【编码计划使用情况】\n")
+        write("-" * 80 + "\n")
         
         status_icon = '●' if plan_info.status == 'Running' else '○'
         status_text = 'Active' if plan_info.status == 'Running' else 'Inactive' if plan_info.status == 'Stopped' else plan_info.status
-        lines.append(f"  状态: {status_icon} {status_text}")
+        write(f"  状态: {status_icon} {status_text}\n")
         
         if plan_info.update_time:
             update_short = plan_info.update_time[5:16] if len(plan_info.update_time) > 16 else plan_info.update_time
-            lines.append(f"  更新时间: {update_short}")
+            write(f"  更新时间: {update_short}\n")
         
-        lines.append("")
-        lines.append(f"  {'类型':<12} {'已用':<8} {'进度':<30} {'重置时间':<15}")
-        lines.append("  " + "-" * 76)
+        write("\n")
+        write(f"  {'类型':<12} {'已用':<8} {'进度':<30} {'重置时间':<15}\n")
+        write("  " + "-" * 76 + "\n")
         
         level_names = {
             'session': 'Session',
@@ -548,17 +754,18 @@ def _format_platform_info_table(cost_info, package_info, plan_info, target_curre
             else:
                 reset_display = "—"
             
-            lines.append(f"  {level_display:<12} {percent_str:>6}{warn_suffix:<2} {bar}  {reset_display:>12}")
+            write(f"  {level_display:<12} {percent_str:>6}{warn_suffix:<2} {bar}  {reset_display:>12}\n")
     else:
-        lines.append("\n【编码计划使用情况】")
-        lines.append("-" * 80)
-        lines.append("  该平台不支持编码计划监控")
+        write("\n【编码计划使用情况】\n")
+        write("-" * 80 + "\n")
+        write("  该平台不支持编码计划监控\n")
     
-    lines.append("=" * 80)
-    return '\n'.join(lines)
+    write("=" * 80 + "\n")
+    return buf.getvalue()[:-1]
 
+@lru_cache(maxsize=1)
 def ensure_config_dir():
-    """Ensure configuration directory exists"""
+    """Ensure configuration directory exists (checked once per process)"""
     home = Path.home()
     config_dir = home / '.llm_balance'
     config_dir.mkdir(exist_ok=True)
@@ -8,11 +8,52 @@ import subprocess
 import json
 import sys
 import os
+import random
 import re
+import shutil
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import Dict, List, Tuple, Any
-import argparse
+import functools
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+# stderr 中出现这些状态码（整词匹配，避免误中 "1500"、"5000 ms" 等数字）视为限流或服务端临时错误，退避后重试
+_RETRY_PATTERN = re.compile(r'\b(?:429|50[0234])\b|Too Many Requests')
+_RETRY_ATTEMPTS = 3
+
+# 测试报告的固定部分：汇总信息表头和失败时的建议
+_REPORT_HEADER = "\n".join([
+    "=" * 60,
+    "🧪 llm-balance 自动化测试报告",
+    "=" * 60,
+    "测试时间: {start_time}",
+    "总测试数: {total}",
+    "通过: {passed}",
+    "失败: {failed}",
+    "总耗时: {total_time:.2f} 秒",
+    "成功率: {success_rate:.1f}%",
+    "",
+    "📋 详细测试结果:",
+    "-" * 40,
+])
+_REPORT_SUGGESTIONS = "\n".join([
+    "💡 建议:",
+    "- 检查环境变量配置",
+    "- 确认网络连接正常",
+    "- 验证 API 密钥有效性",
+    "- 查看详细错误信息进行针对性修复",
+])
+
+def _json_loads(text: str) -> Any:
+    """解析 JSON 文本，安装了 orjson 时使用 orjson"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
 
 class TestResult:
     """测试结果类"""
@@ -21,11 +62,35 @@ class TestResult:
         self.success = False
         self.error_message = ""
         self.execution_time = 0
-        self.output = ""
+        # 输出按段累积，读取 output 时才合并
+        self._output_parts = []
         self.platforms_tested = []
         self.platforms_passed = []
         self.platforms_failed = []
     
+    @property
+    def output(self) -> str:
+        """测试输出"""
+        if len(self._output_parts) > 1:
+            self._output_parts = ["".join(self._output_parts)]
+        return self._output_parts[0] if self._output_parts else ""
+    
+    @output.setter
+    def output(self, value: str):
+        self._output_parts = [value]
+        self.__dict__.pop('output_summary', None)
+    
+    def append_output(self, text: str):
+        """追加一段测试输出"""
+        self._output_parts.append(text)
+        self.__dict__.pop('output_summary', None)
+    
+    @functools.cached_property
+    def output_summary(self) -> str:
+        """截断到 200 字符的输出摘要，输出变化时重新计算"""
+        output = self.output
+        return output[:200] + "..." if len(output) > 200 else output
+    
     def add_platform_result(self, platform: str, success: bool, error: str = ""):
         """添加平台测试结果"""
         if success:
@@ -45,17 +110,29 @@ class TestResult:
             'platforms_passed': len(self.platforms_passed),
             'platforms_failed': len(self.platforms_failed),
             'failed_platforms': self.platforms_failed,
-            'output_summary': self.output[:200] + "..." if len(self.output) > 200 else self.output
+            'output_summary': self.output_summary
         }
 
 class LLMBalanceTester:
     """llm-balance 自动化测试器"""
     
-    def __init__(self, verbose: bool = False, fail_fast: bool = False):
+    def __init__(self, verbose: bool = False, fail_fast: bool = False, concurrency: int = 8):
         self.verbose = verbose
         self.fail_fast = fail_fast
         self.test_results = []
+        # 随结果记录累计的统计，生成报告时不必再遍历全部结果
+        self._passed = 0
+        self._failed = 0
+        self._total_time = 0.0
+        # 环境检查之后的测试是否全部通过
+        self._tests_all_passed = True
         self.start_time = datetime.now()
+        self._log_timestamp = (0, "")
+        # 只在启动时按 PATH 查找一次 llm-balance，之后直接执行其绝对路径
+        self.llm_balance = shutil.which('llm-balance') or 'llm-balance'
+        # 各次 llm-balance 调用主要在等待网络，用线程池并发执行；
+        # 限制同时运行的进程数，避免触发平台限流
+        self.max_workers = max(1, concurrency)
         
         # 支持的输出格式
         self.output_formats = ['table', 'json', 'total', 'markdown']
@@ -65,6 +142,13 @@ class LLMBalanceTester:
             'volcengine', 'zhipu', 'deepseek', 'moonshot', 
             'siliconflow', 'tencent', 'aliyun'
         ]
+        # 表格解析用：一次匹配找出行内的平台名，以及 cost 行中的无数据/错误标记。
+        # 每个平台各占一个分组，按 lastindex 直接取出预先小写并驻留的平台名，无需逐行 lower()
+        self._platform_names = tuple(sys.intern(p.lower()) for p in self.expected_platforms)
+        self._platform_re = re.compile(
+            '|'.join(f'({re.escape(p)})' for p in self._platform_names), re.IGNORECASE
+        )
+        self._cost_error_re = re.compile(r'No data|(?i:error)')
         
         # 环境变量检查
         self.required_env_vars = {
@@ -79,25 +163,37 @@ class LLMBalanceTester:
     
     def log(self, message: str):
         """日志输出"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] {message}")
+        # 时间戳精确到秒，同一秒内复用已格式化的字符串
+        now = int(time.time())
+        second, timestamp = self._log_timestamp
+        if now != second:
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+            # 整体替换元组，多线程下读到的秒数和字符串始终配对
+            self._log_timestamp = (now, timestamp)
+        # 可能在工作线程中调用：消息和换行一次写出，避免多行交错
+        print(f"[{timestamp}] {message}\n", end='')
     
     def run_command(self, command: List[str], timeout: int = 30) -> Tuple[bool, str, str]:
         """运行命令并返回结果"""
         try:
-            start_time = time.time()
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                encoding='utf-8'
-            )
-            execution_time = time.time() - start_time
-            
-            success = result.returncode == 0
-            output = result.stdout
-            error = result.stderr
+            for attempt in range(_RETRY_ATTEMPTS):
+                # 以字节捕获，各自解码一次；stderr 只在失败时才会被用到
+                # Python 创建的文件描述符默认不可继承，无需在子进程中逐个关闭
+                result = subprocess.run(
+                    command,
+                    capture_output=True,
+                    timeout=timeout,
+                    close_fds=False
+                )
+                
+                success = result.returncode == 0
+                output = result.stdout.decode('utf-8', 'replace')
+                error = "" if success else result.stderr.decode('utf-8', 'replace')
+                
+                # 限流或服务端错误：带随机抖动的指数退避后重试
+                if success or attempt == _RETRY_ATTEMPTS - 1 or not _RETRY_PATTERN.search(error):
+                    break
+                time.sleep(random.uniform(0, 2 ** attempt))
             
             return success, output, error
             
@@ -113,18 +209,20 @@ class LLMBalanceTester:
         
         try:
             # 检查 llm-balance 命令是否可用
-            success, output, error = self.run_command(['llm-balance', '--help'])
+            success, output, error = self.run_command([self.llm_balance, '--help'])
             if not success:
                 result.error_message = f"llm-balance 命令不可用: {error}"
                 result.execution_time = time.time() - start_time
                 return result
             
             # 检查环境变量
-            missing_env_vars = []
-            for platform, env_vars in self.required_env_vars.items():
-                for env_var in env_vars:
-                    if not os.getenv(env_var):
-                        missing_env_vars.append(f"{platform}: {env_var}")
+            env = os.environ
+            missing_env_vars = [
+                f"{platform}: {env_var}"
+                for platform, env_vars in self.required_env_vars.items()
+                for env_var in env_vars
+                if not env.get(env_var)
+            ]
             
             if missing_env_vars:
                 result.error_message = f"缺少环境变量: {', '.join(missing_env_vars)}"
@@ -147,7 +245,7 @@ class LLMBalanceTester:
         start_time = time.time()
         
         try:
-            command = ['llm-balance', 'cost', '--format', format_type]
+            command = [self.llm_balance, 'cost', '--format', format_type]
             success, output, error = self.run_command(command)
             
             if not success:
@@ -184,7 +282,7 @@ class LLMBalanceTester:
         start_time = time.time()
         
         try:
-            command = ['llm-balance', 'package', '--format', format_type]
+            command = [self.llm_balance, 'package', '--format', format_type]
             success, output, error = self.run_command(command)
             
             if not success:
@@ -215,29 +313,43 @@ class LLMBalanceTester:
         result.execution_time = time.time() - start_time
         return result
     
-    def test_specific_platform(self, platform: str) -> TestResult:
-        """测试特定平台"""
+    def test_platforms_batch(self, command: str) -> bool:
+        """用一次 `--platform a,b,c` 调用测试全部平台的 cost / package 命令"""
+        success, output, error = self.run_command(
+            [self.llm_balance, command, '--format', 'json', '--platform', ','.join(self.expected_platforms)]
+        )
+        if not success:
+            return False
+        
+        if command == 'cost':
+            # 任一平台出错时 CLI 输出错误文本而不是逐平台的 JSON 数组
+            try:
+                data = _json_loads(output)
+            except ValueError:
+                return False
+            return isinstance(data, list) and len(data) == len(self.expected_platforms)
+        return True
+    
+    def test_specific_platform(self, platform: str, batch_passed: Tuple[str, ...] = ()) -> TestResult:
+        """测试特定平台，batch_passed 中的命令已由批量调用验证，不再单独调用"""
         result = TestResult(f"平台测试: {platform}")
         start_time = time.time()
         
         try:
-            # 测试 cost 命令
-            success, output, error = self.run_command(['llm-balance', 'cost', '--platform', platform])
-            if success:
-                result.add_platform_result(platform, True)
-                result.output += f"cost: {output}\n"
-            else:
-                result.add_platform_result(platform, False, f"cost 失败: {error}")
-                result.output += f"cost: {error}\n"
-            
-            # 测试 package 命令
-            success, output, error = self.run_command(['llm-balance', 'package', '--platform', platform])
-            if success:
-                result.add_platform_result(platform, True)
-                result.output += f"package: {output}\n"
-            else:
-                result.add_platform_result(platform, False, f"package 失败: {error}")
-                result.output += f"package: {error}\n"
+            # 依次测试 cost 和 package 命令
+            for command in ('cost', 'package'):
+                if command in batch_passed:
+                    result.add_platform_result(platform, True)
+                    result.append_output(f"{command}: 批量调用通过\n")
+                    continue
+                
+                success, output, error = self.run_command([self.llm_balance, command, '--platform', platform])
+                if success:
+                    result.add_platform_result(platform, True)
+                    result.append_output(f"{command}: {output}\n")
+                else:
+                    result.add_platform_result(platform, False, f"{command} 失败: {error}")
+                    result.append_output(f"{command}: {error}\n")
             
             result.success = len(result.platforms_failed) == 0
             
@@ -254,7 +366,7 @@ class LLMBalanceTester:
     def _parse_cost_json_output(self, result: TestResult, output: str):
         """解析 cost JSON 输出"""
         try:
-            data = json.loads(output)
+            data = _json_loads(output)
             if isinstance(data, list):
                 for item in data:
                     platform = item.get('platform', 'unknown')
@@ -262,7 +374,7 @@ class LLMBalanceTester:
                         result.add_platform_result(platform, True)
                     else:
                         result.add_platform_result(platform, False, "余额为空")
-        except json.JSONDecodeError:
+        except ValueError:  # json / orjson 的 JSONDecodeError 均为 ValueError 子类
             result.error_message = "JSON 解析失败"
     
     def _parse_cost_table_output(self, result: TestResult, output: str):
@@ -271,13 +383,14 @@ class LLMBalanceTester:
         for line in lines:
             if line.strip() and not line.startswith('-') and not line.startswith('Platform'):
                 # 简单的行解析，查找平台名称
-                for platform in self.expected_platforms:
-                    if platform.lower() in line.lower():
-                        if 'No data' not in line and 'error' not in line.lower():
-                            result.add_platform_result(platform, True)
-                        else:
-                            result.add_platform_result(platform, False, "无数据或错误")
-                        break
+                match = self._platform_re.search(line)
+                if not match:
+                    continue
+                platform = self._platform_names[match.lastindex - 1]
+                if not self._cost_error_re.search(line):
+                    result.add_platform_result(platform, True)
+                else:
+                    result.add_platform_result(platform, False, "无数据或错误")
     
     def _parse_cost_total_output(self, result: TestResult, output: str):
         """解析 cost 总计输出"""
@@ -292,7 +405,7 @@ class LLMBalanceTester:
     def _parse_package_json_output(self, result: TestResult, output: str):
         """解析 package JSON 输出"""
         try:
-            data = json.loads(output)
+            data = _json_loads(output)
             if isinstance(data, dict) and 'platform' in data:
                 platform = data['platform']
                 models = data.get('models', [])
@@ -300,7 +413,7 @@ class LLMBalanceTester:
                     result.add_platform_result(platform, True)
                 else:
                     result.add_platform_result(platform, False, "无模型数据")
-        except json.JSONDecodeError:
+        except ValueError:  # json / orjson 的 JSONDecodeError 均为 ValueError 子类
             result.error_message = "JSON 解析失败"
     
     def _parse_package_table_output(self, result: TestResult, output: str):
@@ -308,13 +421,14 @@ class LLMBalanceTester:
         lines = output.strip().split('\n')
         for line in lines:
             if line.strip() and not line.startswith('-') and not line.startswith('Platform'):
-                for platform in self.expected_platforms:
-                    if platform.lower() in line.lower():
-                        if 'No data' not in line:
-                            result.add_platform_result(platform, True)
-                        else:
-                            result.add_platform_result(platform, False, "无数据")
-                        break
+                match = self._platform_re.search(line)
+                if not match:
+                    continue
+                platform = self._platform_names[match.lastindex - 1]
+                if 'No data' not in line:
+                    result.add_platform_result(platform, True)
+                else:
+                    result.add_platform_result(platform, False, "无数据")
     
     def _parse_package_total_output(self, result: TestResult, output: str):
         """解析 package 总计输出"""
@@ -332,67 +446,94 @@ class LLMBalanceTester:
         
         # 环境检查
         env_result = self.check_environment()
-        self.test_results.append(env_result)
+        self._record(env_result)
         
         if not env_result.success and "命令不可用" in env_result.error_message:
             self.log("❌ 环境检查失败，停止测试")
             return self.test_results
         
-        # 测试 cost 命令
-        for format_type in self.output_formats:
-            cost_result = self.test_cost_command(format_type)
-            self.test_results.append(cost_result)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # 先跑 json 格式，请求结果写入 llm-balance 的本地缓存；其余格式随后并发提交，
+            # 直接从缓存渲染，不再重复请求各平台 API。结果仍按原格式顺序汇总
+            cost_by_format = {'json': executor.submit(self.test_cost_command, 'json')}
+            package_by_format = {'json': executor.submit(self.test_package_command, 'json')}
+            wait([cost_by_format['json'], package_by_format['json']])
+            for format_type in self.output_formats:
+                if format_type not in cost_by_format:
+                    cost_by_format[format_type] = executor.submit(self.test_cost_command, format_type)
+                    package_by_format[format_type] = executor.submit(self.test_package_command, format_type)
+            cost_futures = [(f, cost_by_format[f]) for f in self.output_formats]
+            package_futures = [(f, package_by_format[f]) for f in self.output_formats]
             
-            if self.fail_fast and not cost_result.success:
-                self.log(f"❌ cost ({format_type}) 测试失败，停止测试")
-                break
-        
-        # 测试 package 命令
-        for format_type in self.output_formats:
-            package_result = self.test_package_command(format_type)
-            self.test_results.append(package_result)
+            # 测试 cost 命令
+            self._collect_results(cost_futures, "cost ({})")
             
-            if self.fail_fast and not package_result.success:
-                self.log(f"❌ package ({format_type}) 测试失败，停止测试")
-                break
+            # 测试 package 命令
+            self._collect_results(package_futures, "package ({})")
+            
+            # 测试特定平台（如果前面的测试都通过）
+            if self._tests_all_passed:
+                self.log("测试特定平台...")
+                # cost / package 各先批量调用一次覆盖全部平台，批量失败的命令再逐个平台调用以定位问题
+                batch_futures = [(c, executor.submit(self.test_platforms_batch, c)) for c in ('cost', 'package')]
+                batch_passed = tuple(c for c, future in batch_futures if future.result())
+                platform_futures = [
+                    (p, executor.submit(self.test_specific_platform, p, batch_passed))
+                    for p in self.expected_platforms
+                ]
+                self._collect_results(platform_futures, "平台 {}")
         
-        # 测试特定平台（如果前面的测试都通过）
-        if all(r.success for r in self.test_results[1:]):  # 跳过环境检查
-            self.log("测试特定平台...")
-            for platform in self.expected_platforms:
-                platform_result = self.test_specific_platform(platform)
-                self.test_results.append(platform_result)
-                
-                if self.fail_fast and not platform_result.success:
-                    self.log(f"❌ 平台 {platform} 测试失败，停止测试")
+        return self.test_results
+    
+    def _record(self, result: TestResult):
+        """记录一条测试结果并更新统计"""
+        self.test_results.append(result)
+        self._total_time += result.execution_time
+        if result.success:
+            self._passed += 1
+        else:
+            self._failed += 1
+    
+    def _collect_results(self, futures: List[Tuple[str, Any]], label: str):
+        """按提交顺序收集并发测试结果，fail_fast 时在首个失败处停止并取消未开始的测试"""
+        if self.fail_fast:
+            # 按完成顺序检查：任一测试失败就立即取消尚未开始的测试，不必等排在前面的测试结束
+            pending = {future for _, future in futures}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                if not all(future.result().success for future in done):
+                    for future in pending:
+                        future.cancel()
                     break
         
-        return self.test_results
+        for name, future in futures:
+            # 线程池按提交顺序启动任务，被取消的任务都排在已失败的测试之后
+            if future.cancelled():
+                break
+            result = future.result()
+            self._record(result)
+            self._tests_all_passed &= result.success
+            
+            if self.fail_fast and not result.success:
+                self.log(f"❌ {label.format(name)} 测试失败，停止测试")
+                for _, pending in futures:
+                    pending.cancel()
+                break
     
     def generate_report(self) -> str:
         """生成测试报告"""
         total_tests = len(self.test_results)
-        passed_tests = sum(1 for r in self.test_results if r.success)
-        failed_tests = total_tests - passed_tests
         
-        total_time = sum(r.execution_time for r in self.test_results)
-        
-        report = []
-        report.append("=" * 60)
-        report.append("🧪 llm-balance 自动化测试报告")
-        report.append("=" * 60)
-        report.append(f"测试时间: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"总测试数: {total_tests}")
-        report.append(f"通过: {passed_tests}")
-        report.append(f"失败: {failed_tests}")
-        report.append(f"总耗时: {total_time:.2f} 秒")
-        report.append(f"成功率: {(passed_tests/total_tests*100):.1f}%")
-        report.append("")
+        report = [_REPORT_HEADER.format_map({
+            'start_time': self.start_time.strftime('%Y-%m-%d %H:%M:%S'),
+            'total': total_tests,
+            'passed': self._passed,
+            'failed': self._failed,
+            'total_time': self._total_time,
+            'success_rate': self._passed / total_tests * 100,
+        })]
         
         # 详细结果
-        report.append("📋 详细测试结果:")
-        report.append("-" * 40)
-        
         for result in self.test_results:
             status = "✅ 通过" if result.success else "❌ 失败"
             report.append(f"{status} {result.test_name}")
@@ -411,12 +552,8 @@ class LLMBalanceTester:
             report.append("")
         
         # 建议
-        if failed_tests > 0:
-            report.append("💡 建议:")
-            report.append("- 检查环境变量配置")
-            report.append("- 确认网络连接正常")
-            report.append("- 验证 API 密钥有效性")
-            report.append("- 查看详细错误信息进行针对性修复")
+        if self._failed > 0:
+            report.append(_REPORT_SUGGESTIONS)
         
         return "\n".join(report)
     
@@ -431,32 +568,40 @@ class LLMBalanceTester:
                 'start_time': self.start_time.isoformat(),
                 'end_time': datetime.now().isoformat(),
                 'total_tests': len(self.test_results),
-                'passed_tests': sum(1 for r in self.test_results if r.success),
-                'failed_tests': len(self.test_results) - sum(1 for r in self.test_results if r.success)
+                'passed_tests': self._passed,
+                'failed_tests': self._failed
             },
             'test_results': [r.to_dict() for r in self.test_results]
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            # orjson 直接输出 UTF-8 字节，非 ASCII 字符原样保留
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(report_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(report_data, f, indent=2, ensure_ascii=False)
         
         self.log(f"📄 JSON 报告已保存: {filename}")
         return filename
 
 def main():
+    import argparse
+    
     parser = argparse.ArgumentParser(description='llm-balance 自动化测试脚本')
     parser.add_argument('--verbose', '-v', action='store_true', help='详细输出')
     parser.add_argument('--fail-fast', '-f', action='store_true', help='遇到失败立即停止')
     parser.add_argument('--json-report', action='store_true', help='生成 JSON 报告')
     parser.add_argument('--platforms', nargs='+', help='只测试指定平台')
+    parser.add_argument('--concurrency', '-j', type=int, default=8, help='同时运行的 llm-balance 进程数上限 (默认 8)')
     
     args = parser.parse_args()
     
     # 创建测试器
-    tester = LLMBalanceTester(verbose=args.verbose, fail_fast=args.fail_fast)
+    tester = LLMBalanceTester(verbose=args.verbose, fail_fast=args.fail_fast, concurrency=args.concurrency)
     
     # 运行测试
-    results = tester.run_all_tests()
+    tester.run_all_tests()
     
     # 生成报告
     report = tester.generate_report()
@@ -467,14 +612,11 @@ def main():
         tester.save_json_report()
     
     # 返回适当的退出码
-    success_count = sum(1 for r in results if r.success)
-    total_count = len(results)
-    
-    if success_count == total_count:
+    if tester._failed == 0:
         print("🎉 所有测试通过！")
         sys.exit(0)
     else:
-        print(f"⚠️  {total_count - success_count} 个测试失败")
+        print(f"⚠️  {tester._failed} 个测试失败")
         sys.exit(1)
 
 if __name__ == "__main__":